@@ -1,18 +1,75 @@
+import logging
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelectMultiple
 from django import forms
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.urls import path, reverse
 from django.utils.html import format_html
-from django.db import transaction
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.db.models import Count
 from django.http import JsonResponse
+from django.core.cache import cache
+from functools import lru_cache
+from types import MappingProxyType
 from .models import (
     EmailTemplate, Recipient, EmailCampaign, EmailLog, EmailConfiguration, 
     EmailAttachment, TemplateAttachment, ScheduledEmailCampaign, 
     SequentialEmailCampaign, SequentialEmailRecipient
 )
 from .forms import BulkImportRecipientsForm, ScheduledEmailForm, SequentialEmailForm
+from .import_service import get_import_status, start_recipient_import
+from .tasks import get_task_status, run_in_background, send_scheduled_campaign_task, start_test_email
+
+
+logger = logging.getLogger(__name__)
+
+# Changelist progress bar markup, filled with the bar width and label percentage
+PROGRESS_BAR_HTML = (
+    '<div style="width: 100px; background: #f0f0f0; border-radius: 3px;">'
+    '<div style="width: {}%; background: #28a745; height: 20px; border-radius: 3px; text-align: center; color: white; font-size: 12px; line-height: 20px;">'
+    '{}%</div></div>'
+)
+
+# Sample recipient data for template previews
+SAMPLE_PREVIEW_DATA = MappingProxyType({
+    'name': 'John Doe',
+    'first_name': 'John',
+    'last_name': 'Doe',
+    'email': 'john.doe@example.com',
+    'company': 'Example Company'
+})
+
+
+@lru_cache(maxsize=1)
+def get_placeholder_help():
+    """Render the static placeholder help markup once per process"""
+    return render_to_string('admin/email_api/emailtemplate/placeholder_help.html')
+
+
+@lru_cache(maxsize=None)
+def get_dashboard_url(viewname):
+    """Reverse a dashboard URL name once per process"""
+    return reverse(viewname)
+
+
+class ChangeListOnlyFieldsMixin:
+    """Restrict changelist queries to the columns listed in changelist_only_fields"""
+    changelist_only_fields = ()
+    
+    def get_changelist(self, request, **kwargs):
+        changelist_class = super().get_changelist(request, **kwargs)
+        only_fields = self.changelist_only_fields
+        if not only_fields:
+            return changelist_class
+        
+        # Change forms keep using the full queryset; only the list view is narrowed
+        class OnlyFieldsChangeList(changelist_class):
+            def get_queryset(self, request, *args, **kwargs):
+                return super().get_queryset(request, *args, **kwargs).only(*only_fields)
+        
+        return OnlyFieldsChangeList
 
 
 class EmailTemplateAdminForm(forms.ModelForm):
@@ -20,98 +77,37 @@ class EmailTemplateAdminForm(forms.ModelForm):
         model = EmailTemplate
         fields = '__all__'
     
+    class Media:
+        js = ('admin/js/placeholder-insert.js',)
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['is_html'].widget = forms.HiddenInput()
         self.fields['is_html'].initial = True
         
         # Add help text for placeholders with inline buttons
-        placeholder_help = """
-        <div style="margin-top: 10px; padding: 10px; background-color: #f8f9fa; border: 1px solid #dee2e6; border-radius: 4px;">
-            <strong>Available Placeholders:</strong>
-            <div style="margin: 8px 0;">
-                <button type="button" onclick="insertPlaceholder('$name')" style="margin: 2px; padding: 4px 8px; background: #007cba; color: white; border: none; border-radius: 3px; font-size: 11px; cursor: pointer;">
-                    📋 $name
-                </button>
-                <button type="button" onclick="insertPlaceholder('$first_name')" style="margin: 2px; padding: 4px 8px; background: #007cba; color: white; border: none; border-radius: 3px; font-size: 11px; cursor: pointer;">
-                    👤 $first_name
-                </button>
-                <button type="button" onclick="insertPlaceholder('$last_name')" style="margin: 2px; padding: 4px 8px; background: #007cba; color: white; border: none; border-radius: 3px; font-size: 11px; cursor: pointer;">
-                    👤 $last_name
-                </button>
-                <button type="button" onclick="insertPlaceholder('$email')" style="margin: 2px; padding: 4px 8px; background: #007cba; color: white; border: none; border-radius: 3px; font-size: 11px; cursor: pointer;">
-                    📧 $email
-                </button>
-                <button type="button" onclick="insertPlaceholder('$company')" style="margin: 2px; padding: 4px 8px; background: #007cba; color: white; border: none; border-radius: 3px; font-size: 11px; cursor: pointer;">
-                    🏢 $company
-                </button>
-            </div>
-            <div style="margin-top: 8px; font-size: 12px; color: #666;">
-                Click a button to insert at cursor position, or see descriptions below:
-            </div>
-            <ul style="margin: 5px 0; padding-left: 20px; font-size: 12px;">
-                <li><code>$name</code> - Display name (e.g., "John Doe")</li>
-                <li><code>$first_name</code> - First name (e.g., "John")</li>
-                <li><code>$last_name</code> - Last name (e.g., "Doe")</li>
-                <li><code>$email</code> - Email address</li>
-                <li><code>$company</code> - Company name</li>
-            </ul>
-            
-            <script>
-            function insertPlaceholder(placeholder) {
-                console.log('Inserting placeholder:', placeholder);
-                
-                // Try CKEditor 5 first
-                if (window.editor && window.editor.model) {
-                    window.editor.model.change(writer => {
-                        const insertPosition = window.editor.model.document.selection.getFirstPosition();
-                        writer.insertText(placeholder, insertPosition);
-                    });
-                    return;
-                }
-                
-                // Try to find CKEditor instance
-                const ckInstances = window.CKEDITOR?.instances;
-                if (ckInstances) {
-                    const editorName = Object.keys(ckInstances)[0];
-                    if (editorName && ckInstances[editorName]) {
-                        ckInstances[editorName].insertText(placeholder);
-                        return;
-                    }
-                }
-                
-                // Fallback to textarea
-                const bodyField = document.querySelector('#id_body, textarea[name="body"]');
-                if (bodyField) {
-                    const cursorPos = bodyField.selectionStart;
-                    const textBefore = bodyField.value.substring(0, cursorPos);
-                    const textAfter = bodyField.value.substring(cursorPos);
-                    bodyField.value = textBefore + placeholder + textAfter;
-                    bodyField.focus();
-                    bodyField.setSelectionRange(cursorPos + placeholder.length, cursorPos + placeholder.length);
-                }
-            }
-            </script>
-        </div>
-        """
-        
         self.fields['body'].help_text = (
-            self.fields['body'].help_text + placeholder_help
+            self.fields['body'].help_text + get_placeholder_help()
         )
 
 
 class TemplateAttachmentInline(admin.TabularInline):
     model = TemplateAttachment
     extra = 0
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('attachment', 'template')
 
 
 @admin.register(EmailTemplate)
-class EmailTemplateAdmin(admin.ModelAdmin):
+class EmailTemplateAdmin(ChangeListOnlyFieldsMixin, admin.ModelAdmin):
     form = EmailTemplateAdminForm
     list_display = ['name', 'subject', 'is_html', 'created_at', 'updated_at']
+    changelist_only_fields = ['id', 'name', 'subject', 'is_html', 'created_at', 'updated_at']
     list_filter = ['is_html', 'created_at']
     search_fields = ['name', 'subject']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['created_by']
     inlines = [TemplateAttachmentInline]
     
     class Media:
@@ -148,118 +144,29 @@ class RecipientAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'created_at']
     search_fields = ['email', 'name', 'first_name', 'last_name', 'company']
     readonly_fields = ['created_at', 'updated_at']
-    actions = ['bulk_import_recipients']
+    show_full_result_count = False
     
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path('bulk-import/', self.admin_site.admin_view(self.bulk_import_view), name='email_api_recipient_bulk_import'),
+            path('bulk-import/<str:import_id>/', self.admin_site.admin_view(self.bulk_import_status_view), name='email_api_recipient_bulk_import_status'),
         ]
         return custom_urls + urls
     
-    def bulk_import_recipients(self, request, queryset):
-        """Custom admin action to redirect to bulk import page"""
-        return redirect('admin:email_api_recipient_bulk_import')
-    
-    bulk_import_recipients.short_description = "Bulk import recipients from file"
-    
     def bulk_import_view(self, request):
         """Handle bulk import of recipients"""
         if request.method == 'POST':
             form = BulkImportRecipientsForm(request.POST, request.FILES)
             if form.is_valid():
                 try:
-                    recipients_data = form.process_file()
-                    update_existing = form.cleaned_data.get('update_existing', False)
-                    
-                    created_count = 0
-                    updated_count = 0
-                    skipped_count = 0
-                    errors = []
-                    
-                    with transaction.atomic():
-                        for data in recipients_data:
-                            try:
-                                # Handle email generation or validation
-                                email = data.get('email', '').strip()
-                                
-                                if not email:
-                                    # Generate email from names
-                                    first_name = data.get('first_name', '').lower().replace(' ', '')
-                                    last_name = data.get('last_name', '').lower().replace(' ', '')
-                                    
-                                    if first_name and last_name:
-                                        email = f"{first_name}.{last_name}@example.com"
-                                    elif first_name:
-                                        email = f"{first_name}@example.com"
-                                    elif last_name:
-                                        email = f"{last_name}@example.com"
-                                    else:
-                                        errors.append(f"Row {data.get('row_number', 'unknown')}: Cannot generate email without first or last name")
-                                        continue
-                                
-                                # Ensure email is valid and unique
-                                base_email = email
-                                counter = 1
-                                while Recipient.objects.filter(email=email).exists():
-                                    if update_existing:
-                                        break  # We'll update the existing one
-                                    # Generate unique email by adding counter
-                                    name_part, domain = base_email.split('@')
-                                    email = f"{name_part}{counter}@{domain}"
-                                    counter += 1
-                                
-                                # Check if recipient exists
-                                existing_recipient = None
-                                try:
-                                    existing_recipient = Recipient.objects.get(email=email)
-                                except Recipient.DoesNotExist:
-                                    pass
-                                
-                                if existing_recipient:
-                                    if update_existing:
-                                        # Update existing recipient
-                                        existing_recipient.name = data.get('name') or existing_recipient.name
-                                        existing_recipient.first_name = data.get('first_name') or existing_recipient.first_name
-                                        existing_recipient.last_name = data.get('last_name') or existing_recipient.last_name
-                                        existing_recipient.save()
-                                        updated_count += 1
-                                    else:
-                                        skipped_count += 1
-                                else:
-                                    # Create new recipient
-                                    Recipient.objects.create(
-                                        email=email,
-                                        name=data.get('name', ''),
-                                        first_name=data.get('first_name', ''),
-                                        last_name=data.get('last_name', ''),
-                                    )
-                                    created_count += 1
-                                    
-                            except Exception as e:
-                                errors.append(f"Row {data.get('row_number', 'unknown')}: {str(e)}")
-                    
-                    # Prepare success message
-                    success_parts = []
-                    if created_count > 0:
-                        success_parts.append(f"{created_count} recipients created")
-                    if updated_count > 0:
-                        success_parts.append(f"{updated_count} recipients updated")
-                    if skipped_count > 0:
-                        success_parts.append(f"{skipped_count} recipients skipped")
-                    
-                    if success_parts:
-                        messages.success(request, "Import completed successfully: " + ", ".join(success_parts))
-                    
-                    if errors:
-                        error_message = "Some errors occurred during import:\n" + "\n".join(errors[:10])  # Limit to first 10 errors
-                        if len(errors) > 10:
-                            error_message += f"\n... and {len(errors) - 10} more errors"
-                        messages.warning(request, error_message)
+                    # Import on a background thread so large files don't hold up the request
+                    import_id = start_recipient_import(
+                        form.cleaned_data['file'],
+                        form.cleaned_data.get('update_existing', False)
+                    )
+                    return redirect('admin:email_api_recipient_bulk_import_status', import_id=import_id)
                     
-                    if not errors or (created_count + updated_count) > 0:
-                        return redirect('admin:email_api_recipient_changelist')
-                        
                 except Exception as e:
                     messages.error(request, f"Error processing file: {str(e)}")
         else:
@@ -273,22 +180,83 @@ class RecipientAdmin(admin.ModelAdmin):
         }
         
         return render(request, 'admin/email_api/recipient/bulk_import.html', context)
+    
+    def bulk_import_status_view(self, request, import_id):
+        """Show progress of a background bulk import and report the result once done"""
+        status = get_import_status(import_id)
+        if status is None:
+            messages.error(request, "Import not found or expired")
+            return redirect('admin:email_api_recipient_bulk_import')
+        
+        if status['status'] == 'failed':
+            messages.error(request, status['error'])
+            return redirect('admin:email_api_recipient_bulk_import')
+        
+        if status['status'] == 'completed':
+            created_count = status['created_count']
+            updated_count = status['updated_count']
+            skipped_count = status['skipped_count']
+            errors = status['errors']
+            
+            # Prepare success message
+            success_parts = []
+            if created_count > 0:
+                success_parts.append(f"{created_count} recipients created")
+            if updated_count > 0:
+                success_parts.append(f"{updated_count} recipients updated")
+            if skipped_count > 0:
+                success_parts.append(f"{skipped_count} recipients skipped")
+            
+            if success_parts:
+                messages.success(request, "Import completed successfully: " + ", ".join(success_parts))
+            
+            if errors:
+                error_message = "Some errors occurred during import:\n" + "\n".join(errors[:10])  # Limit to first 10 errors
+                if len(errors) > 10:
+                    error_message += f"\n... and {len(errors) - 10} more errors"
+                messages.warning(request, error_message)
+            
+            if not errors or (created_count + updated_count) > 0:
+                return redirect('admin:email_api_recipient_changelist')
+            return redirect('admin:email_api_recipient_bulk_import')
+        
+        context = {
+            'import_status': status,
+            'title': 'Bulk Import Recipients',
+            'opts': self.model._meta,
+            'has_view_permission': True,
+        }
+        
+        return render(request, 'admin/email_api/recipient/bulk_import_status.html', context)
 
 
 @admin.register(EmailCampaign)
-class EmailCampaignAdmin(admin.ModelAdmin):
+class EmailCampaignAdmin(ChangeListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = ['name', 'status', 'template', 'created_by', 'created_at', 'started_at']
+    list_select_related = ['template', 'created_by']
+    changelist_only_fields = [
+        'id', 'name', 'status', 'created_at', 'started_at',
+        'template', 'template__name', 'created_by', 'created_by__username'
+    ]
     list_filter = ['status', 'created_at', 'started_at']
     search_fields = ['name', 'subject']
     readonly_fields = ['created_at', 'started_at', 'completed_at']
+    raw_id_fields = ['template', 'created_by']
 
 
 @admin.register(EmailLog)
-class EmailLogAdmin(admin.ModelAdmin):
+class EmailLogAdmin(ChangeListOnlyFieldsMixin, admin.ModelAdmin):
     list_display = ['recipient_email', 'subject', 'status', 'campaign', 'sent_at']
+    list_select_related = ['campaign']
+    changelist_only_fields = [
+        'id', 'recipient_email', 'subject', 'status', 'sent_at', 'created_at',
+        'campaign', 'campaign__name'
+    ]
     list_filter = ['status', 'sent_at', 'created_at']
     search_fields = ['recipient_email', 'recipient_name', 'subject']
     readonly_fields = ['created_at', 'sent_at']
+    raw_id_fields = ['campaign']
+    show_full_result_count = False
     
     def has_add_permission(self, request):
         # Email logs should only be created programmatically
@@ -316,36 +284,69 @@ class EmailConfigurationAdmin(admin.ModelAdmin):
     )
 
 
-class TemplateAttachmentInline(admin.TabularInline):
-    model = TemplateAttachment
-    extra = 0
+class ContentTypeListFilter(admin.SimpleListFilter):
+    """Content type filter whose DISTINCT lookup query is cached between page loads"""
+    title = 'content type'
+    parameter_name = 'content_type'
+    cache_key = 'email_api:attachment_content_types'
+    cache_timeout = 300  # seconds
+    
+    def lookups(self, request, model_admin):
+        content_types = cache.get_or_set(
+            self.cache_key,
+            lambda: list(
+                EmailAttachment.objects.exclude(content_type='')
+                .order_by('content_type')
+                .values_list('content_type', flat=True)
+                .distinct()
+            ),
+            self.cache_timeout,
+        )
+        return [(content_type, content_type) for content_type in content_types]
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(content_type=self.value())
+        return queryset
 
 
 @admin.register(EmailAttachment)
 class EmailAttachmentAdmin(admin.ModelAdmin):
     list_display = ['name', 'file_size_display', 'content_type', 'created_by', 'created_at']
-    list_filter = ['content_type', 'created_at']
+    list_filter = [ContentTypeListFilter, 'created_at']
     search_fields = ['name']
     readonly_fields = ['created_at', 'file_size_display', 'content_type']
+    raw_id_fields = ['created_by']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('created_by')
     
     def file_size_display(self, obj):
         return obj.get_file_size_display()
     file_size_display.short_description = 'File Size'
+    file_size_display.admin_order_field = 'file_size'
 
 
 @admin.register(ScheduledEmailCampaign)
-class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
+class ScheduledEmailCampaignAdmin(ChangeListOnlyFieldsMixin, admin.ModelAdmin):
     form = ScheduledEmailForm
     list_display = [
         'name', 'template', 'status', 'interval', 'scheduled_datetime', 
         'next_send_at', 'recipient_count', 'total_sent', 'total_failed', 'created_by'
     ]
+    list_select_related = ['template', 'created_by']
+    changelist_only_fields = [
+        'id', 'name', 'status', 'interval', 'scheduled_datetime', 'next_send_at',
+        'total_sent', 'total_failed', 'created_at',
+        'template', 'template__name', 'created_by', 'created_by__username'
+    ]
     list_filter = ['status', 'interval', 'created_at', 'scheduled_datetime']
     search_fields = ['name', 'template__name']
     readonly_fields = [
         'created_at', 'updated_at', 'last_sent_at', 'next_send_at', 
         'total_sent', 'total_failed'
     ]
+    autocomplete_fields = ['recipients']
     actions = ['send_now', 'pause_campaign', 'resume_campaign', 'cancel_campaign']
     
     fieldsets = (
@@ -371,7 +372,7 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
     def changelist_view(self, request, extra_context=None):
         """Add dashboard link to changelist view"""
         extra_context = extra_context or {}
-        extra_context['dashboard_url'] = reverse('admin:email_api_send_email_dashboard')
+        extra_context['dashboard_url'] = get_dashboard_url('admin:email_api_send_email_dashboard')
         return super().changelist_view(request, extra_context)
     
     def get_urls(self):
@@ -392,12 +393,37 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.send_test_email), 
                 name='email_api_send_test_email'
             ),
+            path(
+                'send-test-email-status/<str:task_id>/', 
+                self.admin_site.admin_view(self.send_test_email_status), 
+                name='email_api_send_test_email_status'
+            ),
         ]
         return custom_urls + urls
     
+    def get_queryset(self, request):
+        # Count recipients in the changelist query instead of once per row
+        return super().get_queryset(request).annotate(_recipient_count=Count('recipients'))
+    
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        # ScheduledEmailForm sets its own widget; let autocomplete_fields replace it
+        if db_field.name in self.autocomplete_fields:
+            kwargs.pop('widget', None)
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+    
+    def _use_recipient_autocomplete(self, form):
+        """Search recipients through the admin autocomplete view instead of rendering them all"""
+        field = form.fields['recipients']
+        field.widget = AutocompleteSelectMultiple(
+            self.model._meta.get_field('recipients'), self.admin_site, attrs={'style': 'width: 100%;'}
+        )
+        field.widget.choices = field.choices
+        field.help_text = "Search recipients by name or email and select one or more."
+    
     def recipient_count(self, obj):
-        return obj.recipients.count()
+        return obj._recipient_count
     recipient_count.short_description = 'Recipients'
+    recipient_count.admin_order_field = '_recipient_count'
     
     def save_model(self, request, obj, form, change):
         if not change:  # If creating new object
@@ -406,22 +432,21 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
     
     def send_now(self, request, queryset):
         """Send selected campaigns immediately"""
-        from .email_service import send_scheduled_campaign_emails
+        campaigns = queryset.filter(status__in=['draft', 'scheduled', 'active'])
+        campaign_names = list(campaigns.values_list('id', 'name'))
         
+        # Each campaign sends on its own thread, so they run in parallel; the
+        # send marks the campaign 'sending' and then sets its final status
         sent_count = 0
-        for campaign in queryset.filter(status__in=['draft', 'scheduled', 'active']):
+        for campaign_id, campaign_name in campaign_names:
             try:
-                result = send_scheduled_campaign_emails(campaign)
-                if result.get('success'):
-                    sent_count += 1
-                    campaign.status = 'active'
-                    campaign.last_sent_at = timezone.now()
-                    campaign.save()
+                run_in_background(send_scheduled_campaign_task, campaign_id)
+                sent_count += 1
             except Exception as e:
-                messages.error(request, f"Failed to send campaign '{campaign.name}': {str(e)}")
+                messages.error(request, f"Failed to send campaign '{campaign_name}': {str(e)}")
         
         if sent_count > 0:
-            messages.success(request, f"Successfully sent {sent_count} campaign(s).")
+            messages.success(request, f"Sending {sent_count} campaign(s) in the background.")
     
     send_now.short_description = "Send selected campaigns now"
     
@@ -453,6 +478,7 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
         """Custom dashboard for sending emails"""
         if request.method == 'POST':
             form = ScheduledEmailForm(request.POST)
+            self._use_recipient_autocomplete(form)
             if form.is_valid():
                 campaign = form.save(commit=False)
                 campaign.created_by = request.user
@@ -464,18 +490,12 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
                 if (campaign.interval == 'once' and 
                     campaign.scheduled_datetime <= timezone.now()):
                     try:
-                        from .email_service import send_scheduled_campaign_emails
-                        result = send_scheduled_campaign_emails(campaign)
-                        if result.get('success'):
-                            campaign.status = 'completed'
-                            campaign.last_sent_at = timezone.now()
-                            campaign.save()
-                            messages.success(
-                                request, 
-                                f"Email campaign '{campaign.name}' sent successfully to {result.get('sent_count', 0)} recipients."
-                            )
-                        else:
-                            messages.error(request, f"Failed to send campaign: {result.get('error', 'Unknown error')}")
+                        # Send in the background; the send marks the campaign completed
+                        run_in_background(send_scheduled_campaign_task, campaign.id)
+                        messages.success(
+                            request, 
+                            f"Email campaign '{campaign.name}' is being sent to {campaign.recipients.count()} recipients."
+                        )
                     except Exception as e:
                         messages.error(request, f"Error sending emails: {str(e)}")
                 else:
@@ -492,11 +512,18 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
                 return redirect('admin:email_api_scheduledemailcampaign_changelist')
         else:
             form = ScheduledEmailForm()
+            self._use_recipient_autocomplete(form)
+        
+        # The template dropdown only shows names, so don't load template bodies
+        form.fields['template'].queryset = EmailTemplate.objects.only('id', 'name')
         
         # Get data for the dashboard
-        templates = EmailTemplate.objects.all()
+        templates = EmailTemplate.objects.only('id', 'name', 'subject').order_by('name')
         recipients = Recipient.objects.filter(is_active=True)
-        recent_campaigns = ScheduledEmailCampaign.objects.select_related('template', 'created_by').order_by('-created_at')[:10]
+        recent_campaigns = ScheduledEmailCampaign.objects.select_related('template', 'created_by').only(
+            'id', 'name', 'status', 'interval', 'scheduled_datetime', 'created_at',
+            'template', 'template__name', 'created_by', 'created_by__username'
+        ).order_by('-created_at')[:10]
         
         context = {
             'title': 'Send Email Dashboard',
@@ -516,24 +543,15 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
         try:
             template = EmailTemplate.objects.get(id=template_id)
             
-            # Sample data for preview
-            sample_data = {
-                'name': 'John Doe',
-                'first_name': 'John',
-                'last_name': 'Doe',
-                'email': 'john.doe@example.com',
-                'company': 'Example Company'
-            }
-            
             from string import Template
             subject_template = Template(template.subject)
             body_template = Template(template.body)
             
-            rendered_subject = subject_template.safe_substitute(**sample_data)
-            rendered_body = body_template.safe_substitute(**sample_data)
+            rendered_subject = subject_template.safe_substitute(SAMPLE_PREVIEW_DATA)
+            rendered_body = body_template.safe_substitute(SAMPLE_PREVIEW_DATA)
             
             # Get attachments
-            attachments = template.attachments.all()
+            attachments = template.attachments.select_related('attachment')
             
             return JsonResponse({
                 'success': True,
@@ -559,48 +577,27 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
             })
     
     def send_test_email(self, request):
-        """Send a test email"""
+        """Start sending a test email and return a task ID to poll"""
         if request.method == 'POST':
             template_id = request.POST.get('template_id')
             test_email = request.POST.get('test_email')
             
             try:
-                template = EmailTemplate.objects.get(id=template_id)
-                
-                # Create a test recipient
-                from .email_service import send_single_email
-                
-                sample_data = {
-                    'name': 'Test User',
-                    'first_name': 'Test',
-                    'last_name': 'User',
-                    'email': test_email,
-                    'company': 'Test Company'
-                }
-                
-                result = send_single_email(
-                    template=template,
-                    recipient_email=test_email,
-                    recipient_name='Test User',
-                    variables=sample_data
-                )
-                
-                if result.get('success'):
-                    return JsonResponse({
-                        'success': True,
-                        'message': f'Test email sent successfully to {test_email}'
-                    })
-                else:
+                if not EmailTemplate.objects.filter(id=template_id).exists():
                     return JsonResponse({
                         'success': False,
-                        'error': result.get('error', 'Unknown error')
+                        'error': 'Template not found'
                     })
-            
-            except EmailTemplate.DoesNotExist:
+                
+                # SMTP can be slow, so send in the background and let the page poll
+                task_id = start_test_email(template_id, test_email)
                 return JsonResponse({
-                    'success': False,
-                    'error': 'Template not found'
+                    'success': True,
+                    'task_id': task_id,
+                    'status_url': reverse('admin:email_api_send_test_email_status', args=[task_id]),
+                    'message': f'Sending test email to {test_email}'
                 })
+            
             except Exception as e:
                 return JsonResponse({
                     'success': False,
@@ -611,6 +608,17 @@ class ScheduledEmailCampaignAdmin(admin.ModelAdmin):
             'success': False,
             'error': 'Invalid request method'
         })
+    
+    def send_test_email_status(self, request, task_id):
+        """Report the state of a background test email"""
+        status = get_task_status(task_id)
+        if status is None:
+            return JsonResponse({
+                'success': False,
+                'state': 'FAILURE',
+                'error': 'Unknown or expired task'
+            })
+        return JsonResponse({'success': status['state'] != 'FAILURE', **status})
 
 
 class SequentialEmailRecipientInline(admin.TabularInline):
@@ -650,10 +658,6 @@ class SequentialEmailCampaignAdminForm(forms.ModelForm):
         ]
     
     def __init__(self, *args, **kwargs):
-        import datetime
-        debug_file = open('/tmp/django_debug.log', 'a')
-        debug_file.write(f"\n=== ADMIN FORM INIT DEBUG {datetime.datetime.now()} ===\n")
-        
         super().__init__(*args, **kwargs)
         
         # Set help texts
@@ -661,86 +665,41 @@ class SequentialEmailCampaignAdminForm(forms.ModelForm):
         self.fields['start_date'].help_text = "Date to start sending emails"
         self.fields['start_time'].help_text = "Time to start sending the first email"
         
-        debug_file.write(f"Form fields: {list(self.fields.keys())}\n")
-        debug_file.write(f"Selected recipients field: {'selected_recipients' in self.fields}\n")
-        debug_file.write(f"Selected recipients widget: {type(self.fields['selected_recipients'].widget)}\n")
+        logger.debug("Sequential campaign form fields: %s", list(self.fields))
         
         # If editing existing campaign, populate selected recipients
         if self.instance and self.instance.pk:
             selected_recipients = self.instance.sequential_recipients.all().order_by('send_order')
             recipient_list = [sr.recipient for sr in selected_recipients]
             self.fields['selected_recipients'].initial = recipient_list
-            debug_file.write(f"Loading existing recipients for campaign {self.instance.pk}: {[r.email for r in recipient_list]}\n")
-        
-        debug_file.write("=== END ADMIN FORM INIT DEBUG ===\n")
-        debug_file.close()
+            logger.debug("Loaded %d existing recipients for campaign %s", len(recipient_list), self.instance.pk)
     
     def clean(self):
-        import datetime
-        debug_file = open('/tmp/django_debug.log', 'a')
-        debug_file.write(f"\n=== ADMIN FORM CLEAN DEBUG {datetime.datetime.now()} ===\n")
-        
         cleaned_data = super().clean()
         
-        debug_file.write(f"Cleaned data keys: {list(cleaned_data.keys())}\n")
-        selected_recipients = cleaned_data.get('selected_recipients', [])
-        debug_file.write(f"Selected recipients count: {len(selected_recipients)}\n")
-        for i, recipient in enumerate(selected_recipients):
-            debug_file.write(f"  Recipient {i}: {recipient.email}\n")
-        debug_file.write("=== END ADMIN FORM CLEAN DEBUG ===\n")
-        debug_file.close()
+        logger.debug("Sequential campaign form cleaned fields: %s", list(cleaned_data))
+        logger.debug("Selected recipients count: %d", len(cleaned_data.get('selected_recipients', [])))
         return cleaned_data
     
     def save(self, commit=True):
-        print("=== ADMIN FORM SAVE DEBUG ===")
-        print("Form data:", self.data)
-        print("Cleaned data:", getattr(self, 'cleaned_data', 'Not available'))
-        
         campaign = super().save(commit=commit)
-        print(f"Campaign saved: {campaign.id} - {campaign.name}")
+        logger.debug("Sequential campaign form saved: %s - %s", campaign.id, campaign.name)
         
         if commit and 'selected_recipients' in self.cleaned_data:
-            selected_recipients = self.cleaned_data.get('selected_recipients', [])
-            print(f"Selected recipients: {list(selected_recipients)}")
-            print(f"Number of recipients: {len(selected_recipients)}")
-            
-            # Clear existing recipients
-            existing_count = campaign.sequential_recipients.count()
-            print(f"Clearing {existing_count} existing recipients")
-            campaign.sequential_recipients.all().delete()
-            
-            # Add selected recipients in order
-            campaign.total_recipients = len(selected_recipients)
-            campaign.save()
-            print(f"Updated total_recipients to: {campaign.total_recipients}")
-            
-            # Create sequential recipient entries
-            from .models import SequentialEmailRecipient
-            from datetime import timedelta
-            
-            for i, recipient in enumerate(selected_recipients):
-                print(f"Creating recipient {i}: {recipient.email}")
-                if campaign.start_datetime:
-                    scheduled_time = campaign.start_datetime + timedelta(
-                        minutes=campaign.interval_minutes * i
-                    )
-                else:
-                    scheduled_time = None
-                
-                seq_recipient = SequentialEmailRecipient.objects.create(
-                    campaign=campaign,
-                    recipient=recipient,
-                    send_order=i,
-                    scheduled_time=scheduled_time,
-                    status='scheduled'
-                )
-                print(f"Created SequentialEmailRecipient: {seq_recipient.id}")
+            self.save_recipients(campaign)
         else:
-            print("No selected_recipients in cleaned_data or not committing")
-            print("Available keys:", list(self.cleaned_data.keys()) if hasattr(self, 'cleaned_data') else 'No cleaned_data')
+            logger.debug("Recipients not saved for campaign %s (commit=%s)", campaign.id, commit)
         
-        print("=== END ADMIN FORM SAVE DEBUG ===")
         return campaign
+    
+    def save_recipients(self, campaign):
+        """Replace the campaign's recipient list with the selected recipients, in order"""
+        selected_recipients = self.cleaned_data.get('selected_recipients', [])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Selected recipients: %s", [recipient.email for recipient in selected_recipients])
+        
+        seq_recipients = campaign.set_recipients(selected_recipients)
+        logger.debug("Created %d sequential recipients for campaign %s", len(seq_recipients), campaign.id)
 
 
 @admin.register(SequentialEmailCampaign)
@@ -761,66 +720,22 @@ class SequentialEmailCampaignAdmin(admin.ModelAdmin):
     
     def get_form(self, request, obj=None, **kwargs):
         """Force use of our custom form"""
-        import datetime
-        debug_file = open('/tmp/django_debug.log', 'a')
-        debug_file.write(f"\n=== GET_FORM DEBUG {datetime.datetime.now()}: using {SequentialEmailCampaignAdminForm.__name__} ===\n")
-        debug_file.close()
-        
         kwargs['form'] = SequentialEmailCampaignAdminForm
         return super().get_form(request, obj, **kwargs)
     
     def save_model(self, request, obj, form, change):
-        # Force an exception to see if this method is called
-        import datetime
-        debug_file = open('/tmp/django_debug.log', 'a')
-        debug_file.write(f"\n=== ADMIN SAVE_MODEL CALLED {datetime.datetime.now()} ===\n")
-        debug_file.write(f"Object: {obj}\n")
-        debug_file.write(f"Form type: {type(form)}\n")
-        debug_file.write(f"Change: {change}\n")
-        debug_file.close()
+        logger.debug("Saving sequential campaign %s (change=%s)", obj, change)
+        
+        if not change:  # If creating new object
+            obj.created_by = request.user
         
         # Save the main object first
         super().save_model(request, obj, form, change)
         
-        # Look for selected recipients in the POST data directly
-        selected_recipient_ids = request.POST.getlist('selected_recipients')
-        
-        if selected_recipient_ids:
-            debug_file = open('/tmp/django_debug.log', 'a')
-            debug_file.write(f"Found {len(selected_recipient_ids)} recipient IDs: {selected_recipient_ids}\n")
-            debug_file.close()
-            
-            from .models import SequentialEmailRecipient
-            from datetime import timedelta
-            
-            # Clear existing recipients
-            obj.sequential_recipients.all().delete()
-            
-            # Add selected recipients in order
-            obj.total_recipients = len(selected_recipient_ids)
-            obj.save()
-            
-            # Create sequential recipient entries
-            for i, recipient_id in enumerate(selected_recipient_ids):
-                try:
-                    recipient = Recipient.objects.get(id=recipient_id)
-                    
-                    if obj.start_datetime:
-                        scheduled_time = obj.start_datetime + timedelta(
-                            minutes=obj.interval_minutes * i
-                        )
-                    else:
-                        scheduled_time = None
-                    
-                    SequentialEmailRecipient.objects.create(
-                        campaign=obj,
-                        recipient=recipient,
-                        send_order=i,
-                        scheduled_time=scheduled_time,
-                        status='scheduled'
-                    )
-                except Recipient.DoesNotExist:
-                    pass
+        # The admin saves the form with commit=False, so write the recipients
+        # the form already validated once the campaign has a primary key
+        if form.cleaned_data.get('selected_recipients'):
+            form.save_recipients(obj)
     
     fieldsets = (
         ('Campaign Information', {
@@ -861,28 +776,17 @@ class SequentialEmailCampaignAdmin(admin.ModelAdmin):
     def changelist_view(self, request, extra_context=None):
         """Add dashboard link to changelist view"""
         extra_context = extra_context or {}
-        extra_context['sequential_dashboard_url'] = reverse('admin:email_api_sequential_email_dashboard')
+        extra_context['sequential_dashboard_url'] = get_dashboard_url('admin:email_api_sequential_email_dashboard')
         return super().changelist_view(request, extra_context)
     
     def progress_display(self, obj):
         if obj.total_recipients == 0:
             return "No recipients"
         
-        progress_percentage = (obj.emails_sent / obj.total_recipients) * 100
-        return format_html(
-            '<div style="width: 100px; background: #f0f0f0; border-radius: 3px;">'
-            '<div style="width: {}%; background: #28a745; height: 20px; border-radius: 3px; text-align: center; color: white; font-size: 12px; line-height: 20px;">'
-            '{}%</div></div>',
-            progress_percentage,
-            int(progress_percentage)
-        )
+        progress_percentage = obj.emails_sent * 100 // obj.total_recipients
+        return format_html(PROGRESS_BAR_HTML, progress_percentage, progress_percentage)
     progress_display.short_description = 'Progress'
     
-    def save_model(self, request, obj, form, change):
-        if not change:  # If creating new object
-            obj.created_by = request.user
-        super().save_model(request, obj, form, change)
-    
     def start_campaign(self, request, queryset):
         """Start selected sequential campaigns"""
         started_count = 0
@@ -966,9 +870,12 @@ class SequentialEmailCampaignAdmin(admin.ModelAdmin):
         else:
             form = SequentialEmailForm()
         
+        # List recipients in the form's own order, which is the order they are
+        # sent in
+        recipients = form.fields['selected_recipients'].queryset
+        
         # Get data for the dashboard
         templates = EmailTemplate.objects.all()
-        recipients = Recipient.objects.filter(is_active=True)
         recent_campaigns = SequentialEmailCampaign.objects.select_related('template', 'created_by').order_by('-created_at')[:10]
         
         context = {
@@ -4,24 +4,157 @@ Email service with file attachments and database integration.
 Supports sending single and bulk emails with logging.
 """
 
+import base64
 import smtplib
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from string import Template
+from typing import Callable, List, Dict, Optional
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connection as db_connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
-from .models import EmailLog, EmailConfiguration
+from .models import (
+    EmailLog, EmailConfiguration, EmailAttachment, EmailCampaign,
+    ScheduledEmailCampaign, SequentialEmailCampaign, SequentialEmailRecipient
+)
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Messages sent over one SMTP connection before it is reopened; providers
+# commonly drop connections after a few thousand messages
+SMTP_MAX_MESSAGES_PER_CONNECTION = 2000
+
+# Seconds a shared SMTP connection may sit unused before it is reopened
+SMTP_IDLE_TIMEOUT = 60
+
+# Stand-in To: address for serialized emails reused across recipients
+MESSAGE_TO_PLACEHOLDER = 'email-api-recipient@placeholder.invalid'
+
+# Sequential campaign recipients that have not been sent to yet; the admin
+# and dashboard create them as 'scheduled', older rows use 'pending'
+SEQUENTIAL_UNSENT_STATUSES = ('pending', 'scheduled')
+
+# Time between sends of a recurring scheduled campaign, by interval;
+# monthly sends are counted from the campaign start instead (see
+# calculate_next_send_time) so short months don't move later sends
+_INTERVAL_DELTA = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(weeks=1),
+}
+
+# Most recipients given to one SMTP transaction when identical emails are grouped
+SMTP_MAX_RECIPIENTS_PER_MESSAGE = 50
+
+# To: header of an email sent to a group of recipients, none of them listed
+GROUP_TO_HEADER = 'undisclosed-recipients:;'
+
+# Most due sequential campaign emails sent over one connection per run
+SEQUENTIAL_SEND_BATCH_SIZE = 50
+
+# Sequential recipients claimed for sending longer ago than this belong to a
+# run that died; they are marked failed rather than risk a second email
+SEQUENTIAL_CLAIM_TIMEOUT = timedelta(minutes=15)
+
+# Scheduled campaigns can be sent from these statuses; a send moves the
+# campaign to 'sending' so no other run sends it at the same time
+SCHEDULED_SENDABLE_STATUSES = ('draft', 'scheduled', 'active')
+
+# Scheduled campaigns still 'sending' after this belong to a run that died;
+# they are paused for an admin to resume rather than risk a second send
+SCHEDULED_CLAIM_TIMEOUT = timedelta(hours=6)
+
+# Campaign recipients rendered, logged and sent together
+SEND_BATCH_SIZE = 100
+
+# Number of email log rows written per query
+EMAIL_LOG_BATCH_SIZE = 500
+
+# Seconds a process reuses a loaded email configuration. Saving or deleting
+# one clears it in that process; other processes pick it up within this time.
+EMAIL_CONFIG_CACHE_TIMEOUT = 60
+
+# Bulk sends stop once at least this many emails were tried and more than
+# this share of them failed, as that usually means a provider-side problem
+BULK_ABORT_MIN_ATTEMPTS = 30
+BULK_ABORT_FAILURE_RATIO = 1 / 3
+BULK_ABORT_MESSAGE = 'Not sent: bulk send aborted after too many failures'
+
+# Bytes of an attachment read and encoded at a time; a multiple of 57 so
+# every chunk encodes to whole 76-character base64 lines
+ATTACHMENT_READ_CHUNK_SIZE = 57 * 1024
+
+
+def _encode_file_base64(file_path) -> str:
+    """Base64-encode a file in chunks, without holding the raw bytes in memory"""
+    encoded_chunks = []
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(ATTACHMENT_READ_CHUNK_SIZE), b''):
+            encoded_chunks.append(base64.encodebytes(chunk).decode('ascii'))
+    return ''.join(encoded_chunks)
+
+
+def compile_template(text: str):
+    """
+    Get a function rendering text's $placeholders from a dict of variables
+    
+    Text without any '$' is returned as-is, skipping the template scan.
+    """
+    if '$' not in text:
+        return lambda variables: text
+    return Template(text).safe_substitute
+
+
+def _is_connection_dropped(error: smtplib.SMTPException) -> bool:
+    """Whether an SMTP error means the server closed the connection"""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    # 421: service not available, closing transmission channel
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421
+
+
+def _is_transient_failure(error) -> bool:
+    """
+    Whether a send failed with a temporary (4xx) SMTP reply such as 421 or
+    450, so it may succeed if retried; 5xx replies such as 554 are permanent
+    
+    error is an exception, or the (code, message) pair of a refused recipient.
+    """
+    if isinstance(error, tuple):
+        return 400 <= error[0] < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return bool(error.recipients) and all(
+            _is_transient_failure(refusal) for refusal in error.recipients.values()
+        )
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, smtplib.SMTPServerDisconnected)
+
+
+def _mark_log_failed(email_log: EmailLog, error):
+    """Record a failed send on its log entry, flagging temporary failures as retryable"""
+    email_log.status = 'failed'
+    email_log.error_message = str(error)
+    if _is_transient_failure(error):
+        email_log.email_metadata = {**email_log.email_metadata, 'retryable': True}
+
 
 @dataclass
 class EmailConfig:
@@ -44,12 +177,171 @@ class EmailData:
     is_html: bool = False
     attachments: List[str] = None  # File paths
     attachment_ids: List[int] = None  # Database attachment IDs
+    log_attachments: tuple = field(init=False, repr=False, compare=False)  # As recorded in EmailLog
 
     def __post_init__(self):
         if self.attachments is None:
             self.attachments = []
         if self.attachment_ids is None:
             self.attachment_ids = []
+        self.log_attachments = (*self.attachments, *_attachment_id_labels(tuple(self.attachment_ids)))
+
+
+@lru_cache(maxsize=128)
+def _attachment_id_labels(attachment_ids: tuple) -> tuple:
+    """Log labels for stored attachments; campaigns reuse one ID list for every email"""
+    return tuple(f"ID:{aid}" for aid in attachment_ids)
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by the threads sending a campaign.
+    Allows bursts of up to capacity sends, refilling at rate sends per second.
+    """
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take a token, sleeping until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Going negative reserves the next token, so waiting threads queue up in turn
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SharedSMTPConnection:
+    """
+    SMTP connection reused across several sends.
+    Connects on the first send, reopens after max_messages sends to stay under
+    provider per-connection limits, and reconnects once if the server drops it.
+    """
+    
+    def __init__(self, sender: 'EmailSender', max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION):
+        self.sender = sender
+        self.max_messages = max_messages
+        self.server = None
+        self.message_count = 0
+        self.last_used = 0.0
+    
+    def sendmail(self, from_addr: str, to_addrs, msg: str):
+        if self.server is not None and (
+            self.message_count >= self.max_messages
+            or time.monotonic() - self.last_used > SMTP_IDLE_TIMEOUT
+        ):
+            self.close()
+        
+        for attempt in range(2):
+            if self.server is None:
+                self.server = self.sender._create_smtp_connection()
+                self.message_count = 0
+                self.last_used = time.monotonic()
+            
+            try:
+                response = self.server.sendmail(from_addr, to_addrs, msg)
+            except smtplib.SMTPException as e:
+                if not _is_connection_dropped(e):
+                    raise
+                self.close()
+                if attempt:
+                    raise
+                logger.warning(f"SMTP connection dropped ({e}), reconnecting")
+                continue
+            
+            self.message_count += 1
+            self.last_used = time.monotonic()
+            return response
+    
+    def close(self):
+        if self.server is None:
+            return
+        
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        finally:
+            self.server = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Loaded email configurations by name (None for the default), with load time
+_config_cache = {}
+
+
+def _cached_config(key, load):
+    """Return load() memoized under key for EMAIL_CONFIG_CACHE_TIMEOUT seconds"""
+    cached = _config_cache.get(key)
+    now = time.monotonic()
+    if cached is None or now - cached[0] > EMAIL_CONFIG_CACHE_TIMEOUT:
+        cached = _config_cache[key] = (now, load())
+    return cached[1]
+
+
+def _load_default_config() -> EmailConfig:
+    """Get the default email configuration, falling back to Django settings"""
+    return _cached_config(None, _default_config_from_db)
+
+
+def _default_config_from_db() -> EmailConfig:
+    default_config = EmailConfiguration.objects.filter(is_default=True, is_active=True).first()
+    if default_config:
+        return EmailConfig(
+            smtp_server=default_config.smtp_server,
+            smtp_port=default_config.smtp_port,
+            username=default_config.username,
+            password=default_config.password,
+            use_tls=default_config.use_tls,
+            use_ssl=default_config.use_ssl
+        )
+    
+    # Fallback to Django settings
+    email_settings = settings.EMAIL_CONFIG
+    return EmailConfig(
+        smtp_server=email_settings['SMTP_SERVER'],
+        smtp_port=email_settings['SMTP_PORT'],
+        username=email_settings['EMAIL_USERNAME'],
+        password=email_settings['EMAIL_PASSWORD'],
+        use_tls=email_settings['USE_TLS']
+    )
+
+
+def _load_named_config(config_name: str) -> Optional[EmailConfig]:
+    """Get an active email configuration by name, or None if there is none"""
+    return _cached_config(config_name, lambda: _named_config_from_db(config_name))
+
+
+def _named_config_from_db(config_name: str) -> Optional[EmailConfig]:
+    config_obj = EmailConfiguration.objects.filter(name=config_name, is_active=True).first()
+    if config_obj is None:
+        return None
+    return EmailConfig(
+        smtp_server=config_obj.smtp_server,
+        smtp_port=config_obj.smtp_port,
+        username=config_obj.username,
+        password=config_obj.password,
+        use_tls=config_obj.use_tls,
+        use_ssl=config_obj.use_ssl
+    )
+
+
+@receiver([post_save, post_delete], sender=EmailConfiguration)
+def _clear_config_caches(**kwargs):
+    _config_cache.clear()
 
 
 class EmailSender:
@@ -57,29 +349,8 @@ class EmailSender:
     
     def __init__(self, config: EmailConfig = None):
         if config is None:
-            # Get default configuration from database
             try:
-                default_config = EmailConfiguration.objects.filter(is_default=True, is_active=True).first()
-                if default_config:
-                    config = EmailConfig(
-                        smtp_server=default_config.smtp_server,
-                        smtp_port=default_config.smtp_port,
-                        username=default_config.username,
-                        password=default_config.password,
-                        use_tls=default_config.use_tls,
-                        use_ssl=default_config.use_ssl
-                    )
-                else:
-                    # Fallback to Django settings
-                    from django.conf import settings
-                    email_settings = settings.EMAIL_CONFIG
-                    config = EmailConfig(
-                        smtp_server=email_settings['SMTP_SERVER'],
-                        smtp_port=email_settings['SMTP_PORT'],
-                        username=email_settings['EMAIL_USERNAME'],
-                        password=email_settings['EMAIL_PASSWORD'],
-                        use_tls=email_settings['USE_TLS']
-                    )
+                config = _load_default_config()
             except Exception as e:
                 logger.error(f"Failed to load email configuration: {e}")
                 raise
@@ -87,6 +358,15 @@ class EmailSender:
         self.config = config
         self.sent_count = 0
         self.failed_count = 0
+        # Guards the counts when several threads send with this sender
+        self._count_lock = threading.Lock()
+        # Encoded attachment payloads by attachment ID, so files shared by every
+        # email in a campaign are read and encoded once per sender
+        self._attachment_parts = {}
+        # Encoded payloads of file-path attachments by (path, mtime, size)
+        self._file_parts = {}
+        # Content key, serialized text and attached file names of the last email
+        self._last_message = None
         
     def _create_smtp_connection(self) -> smtplib.SMTP:
         """Create and configure SMTP connection"""
@@ -113,56 +393,88 @@ class EmailSender:
         if file_paths:
             for file_path in file_paths:
                 file_path = Path(file_path)
-                if not file_path.exists():
+                try:
+                    file_stat = file_path.stat()
+                except FileNotFoundError:
                     logger.warning(f"Attachment file not found: {file_path}")
                     continue
                     
                 try:
-                    with open(file_path, "rb") as attachment:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(attachment.read())
-                        
-                    encoders.encode_base64(part)
+                    # Reuse the encoding while the file is unchanged
+                    cache_key = (str(file_path), file_stat.st_mtime, file_stat.st_size)
+                    encoded_payload = self._file_parts.get(cache_key)
+                    if encoded_payload is None:
+                        encoded_payload = self._file_parts[cache_key] = _encode_file_base64(file_path)
+                    
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(encoded_payload)
+                    part['Content-Transfer-Encoding'] = 'base64'
                     part.add_header(
                         'Content-Disposition',
                         f'attachment; filename= {file_path.name}'
                     )
                     msg.attach(part)
                     attached_files.append(str(file_path))
-                    logger.info(f"Attached file: {file_path.name}")
+                    logger.debug("Attached file: %s", file_path.name)
                     
                 except Exception as e:
                     logger.error(f"Failed to attach file {file_path}: {e}")
         
         # Handle attachment IDs from database
         if attachment_ids:
-            from .models import EmailAttachment
+            self._load_attachment_parts(attachment_ids)
             for attachment_id in attachment_ids:
                 try:
-                    email_attachment = EmailAttachment.objects.get(id=attachment_id)
-                    file_path = email_attachment.get_absolute_path()
+                    cached_part = self._attachment_parts[attachment_id]
+                    if cached_part is None:
+                        continue
                     
-                    if file_path and Path(file_path).exists():
-                        with open(file_path, "rb") as attachment:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-                            
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename= {email_attachment.name}'
-                        )
-                        msg.attach(part)
-                        attached_files.append(email_attachment.name)
-                        logger.info(f"Attached file from DB: {email_attachment.name}")
-                    else:
-                        logger.warning(f"Attachment file not found for ID {attachment_id}")
+                    name, encoded_payload = cached_part
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(encoded_payload)
+                    part['Content-Transfer-Encoding'] = 'base64'
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename= {name}'
+                    )
+                    msg.attach(part)
+                    attached_files.append(name)
+                    logger.debug("Attached file from DB: %s", name)
                         
                 except Exception as e:
                     logger.error(f"Failed to attach file from DB ID {attachment_id}: {e}")
         
         return attached_files
     
+    def _load_attachment_parts(self, attachment_ids: List[int]):
+        """Encode the attachments not cached yet, fetching their rows in one query"""
+        missing_ids = [aid for aid in attachment_ids if aid not in self._attachment_parts]
+        if not missing_ids:
+            return
+        
+        email_attachments = EmailAttachment.objects.in_bulk(missing_ids)
+        for attachment_id in missing_ids:
+            email_attachment = email_attachments.get(attachment_id)
+            if email_attachment is None:
+                logger.error(f"Attachment with ID {attachment_id} does not exist")
+                self._attachment_parts[attachment_id] = None
+                continue
+            try:
+                self._attachment_parts[attachment_id] = self._build_attachment_part(email_attachment)
+            except Exception as e:
+                logger.error(f"Failed to attach file from DB ID {attachment_id}: {e}")
+                self._attachment_parts[attachment_id] = None
+    
+    def _build_attachment_part(self, email_attachment) -> Optional[tuple[str, str]]:
+        """Read and base64-encode a stored attachment, or None if its file is missing"""
+        file_path = email_attachment.get_absolute_path()
+        
+        if not file_path or not Path(file_path).exists():
+            logger.warning(f"Attachment file not found for ID {email_attachment.id}")
+            return None
+        
+        return email_attachment.name, _encode_file_base64(file_path)
+    
     def _create_message(self, email_data: EmailData) -> tuple[MIMEMultipart, List[str]]:
         """Create email message with attachments"""
         msg = MIMEMultipart()
@@ -182,65 +494,287 @@ class EmailSender:
         
         return msg, attached_files
     
-    def send_single_email(self, email_data: EmailData, campaign_id: int = None) -> bool:
-        """Send a single email and log to database"""
-        email_log = EmailLog.objects.create(
+    def open_connection(self) -> SharedSMTPConnection:
+        """Get an SMTP connection to pass to send_single_email() for several sends"""
+        return SharedSMTPConnection(self)
+    
+    def _message_text(self, email_data: EmailData) -> tuple[str, List[str]]:
+        """
+        Serialize an email with its attachments.
+        When the previous email had the same content, its serialized text is
+        reused with only the To: address swapped in.
+        """
+        if not email_data.to_email.isascii():
+            # Non-ASCII addresses are header-encoded, so they can't be swapped in as text
+            msg, attached_files = self._create_message(email_data)
+            return msg.as_string(), attached_files
+        
+        content_key = (
+            email_data.subject, email_data.body, email_data.is_html,
+            tuple(email_data.attachments), tuple(email_data.attachment_ids)
+        )
+        cached = self._last_message
+        if cached is None or cached[0] != content_key:
+            msg, attached_files = self._create_message(replace(email_data, to_email=MESSAGE_TO_PLACEHOLDER))
+            cached = self._last_message = (content_key, msg.as_string(), attached_files)
+        
+        _, text, attached_files = cached
+        return text.replace(MESSAGE_TO_PLACEHOLDER, email_data.to_email, 1), list(attached_files)
+    
+    def build_email_log(self, email_data: EmailData, campaign_id: int = None) -> EmailLog:
+        """Create an unsaved pending log entry for an email"""
+        return EmailLog(
             campaign_id=campaign_id,
             recipient_email=email_data.to_email,
             recipient_name=email_data.to_name,
             subject=email_data.subject,
             body=email_data.body,
             is_html=email_data.is_html,
-            attachments=email_data.attachments + [f"ID:{aid}" for aid in email_data.attachment_ids],
+            attachments=list(email_data.log_attachments),
             status='pending'
         )
+    
+    def send_single_email(self, email_data: EmailData, campaign_id: int = None,
+                          connection: SharedSMTPConnection = None, email_log: EmailLog = None) -> bool:
+        """
+        Send a single email and log to database, over connection if given
+        
+        If email_log is given, its status fields are only updated in memory and
+        the caller is responsible for saving it.
+        """
+        save_log = email_log is None
+        if save_log:
+            email_log = self.build_email_log(email_data, campaign_id)
+            email_log.save()
         
         try:
-            msg, attached_files = self._create_message(email_data)
+            text, attached_files = self._message_text(email_data)
             
-            with self._create_smtp_connection() as server:
-                text = msg.as_string()
-                server.sendmail(self.config.username, email_data.to_email, text)
+            if connection:
+                connection.sendmail(self.config.username, email_data.to_email, text)
+            else:
+                with self._create_smtp_connection() as server:
+                    server.sendmail(self.config.username, email_data.to_email, text)
             
             # Update log on success with actual attached files
             email_log.status = 'sent'
             email_log.sent_at = timezone.now()
             email_log.attachments = attached_files
-            email_log.save()
+            if save_log:
+                email_log.save(update_fields=['status', 'sent_at', 'attachments'])
             
-            self.sent_count += 1
-            logger.info(f"Email sent successfully to {email_data.to_email}")
+            with self._count_lock:
+                self.sent_count += 1
+            logger.debug("Email sent successfully to %s", email_data.to_email)
             return True
             
         except Exception as e:
             # Update log on failure
-            email_log.status = 'failed'
-            email_log.error_message = str(e)
-            email_log.save()
+            _mark_log_failed(email_log, e)
+            if save_log:
+                email_log.save(update_fields=['status', 'error_message', 'email_metadata'])
             
-            self.failed_count += 1
+            with self._count_lock:
+                self.failed_count += 1
             logger.error(f"Failed to send email to {email_data.to_email}: {e}")
             return False
     
-    def send_bulk_emails(self, emails: List[EmailData], campaign_id: int = None, 
-                        delay_between_emails: float = 0) -> Dict[str, int]:
-        """Send multiple emails with optional delay"""
-        results = {"sent": 0, "failed": 0}
-        
-        for email_data in emails:
-            success = self.send_single_email(email_data, campaign_id)
-            if success:
-                results["sent"] += 1
-            else:
-                results["failed"] += 1
+    def send_batch(self, emails: List[EmailData], campaign_id: int = None,
+                   connection: SharedSMTPConnection = None, rate_limiter: TokenBucket = None,
+                   should_stop: Callable[[EmailLog], bool] = None) -> List[bool]:
+        """
+        Send several emails, writing their log entries with one bulk insert
+        and one bulk update instead of two queries per email
+        
+        If given, should_stop is called with each email's log entry once it
+        has been sent or has failed; when it returns True the remaining emails
+        are logged as failed without being sent.
+        
+        Returns:
+            list of bool - whether each email was sent, for the emails tried
+        """
+        # The logs are committed before sending and updated afterwards in a
+        # second short transaction, so no transaction is held open over SMTP
+        email_logs = EmailLog.objects.bulk_create(
+            [self.build_email_log(email_data, campaign_id) for email_data in emails],
+            batch_size=EMAIL_LOG_BATCH_SIZE
+        )
+        
+        results = []
+        for email_data, email_log in zip(emails, email_logs):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            results.append(self.send_single_email(email_data, campaign_id, connection, email_log))
+            if should_stop is not None and should_stop(email_log):
+                break
+        
+        for email_log in email_logs[len(results):]:
+            email_log.status = 'failed'
+            email_log.error_message = BULK_ABORT_MESSAGE
+        
+        EmailLog.objects.bulk_update(
+            email_logs, ['status', 'sent_at', 'error_message', 'attachments', 'email_metadata'],
+            batch_size=EMAIL_LOG_BATCH_SIZE
+        )
+        return results
+    
+    def _log_unsent(self, emails: List[EmailData], campaign_id: int = None, reason: str = ''):
+        """Write failed log entries for emails that were not attempted"""
+        email_logs = [self.build_email_log(email_data, campaign_id) for email_data in emails]
+        for email_log in email_logs:
+            email_log.status = 'failed'
+            email_log.error_message = reason
+        EmailLog.objects.bulk_create(email_logs, batch_size=EMAIL_LOG_BATCH_SIZE)
+    
+    def send_group(self, emails: List[EmailData], campaign_id: int = None,
+                   connection: SharedSMTPConnection = None) -> List[bool]:
+        """
+        Send emails with identical content as one message per
+        SMTP_MAX_RECIPIENTS_PER_MESSAGE recipients, with one log entry each
+        
+        Returns:
+            list of bool - whether each email was sent
+        """
+        if not emails:
+            return []
+        if connection is None:
+            with self.open_connection() as connection:
+                return self.send_group(emails, campaign_id, connection)
+        
+        email_logs = EmailLog.objects.bulk_create(
+            [self.build_email_log(email_data, campaign_id) for email_data in emails],
+            batch_size=EMAIL_LOG_BATCH_SIZE
+        )
+        msg, attached_files = self._create_message(replace(emails[0], to_email=GROUP_TO_HEADER))
+        text = msg.as_string()
+        
+        results = []
+        for i in range(0, len(emails), SMTP_MAX_RECIPIENTS_PER_MESSAGE):
+            chunk = emails[i:i + SMTP_MAX_RECIPIENTS_PER_MESSAGE]
+            addresses = [email_data.to_email for email_data in chunk]
+            try:
+                # Returns the recipients the server refused; the rest were accepted
+                refused = connection.sendmail(self.config.username, addresses, text)
+            except smtplib.SMTPRecipientsRefused as e:
+                refused = e.recipients
+            except Exception as e:
+                refused = dict.fromkeys(addresses, e)
             
-            # Delay between emails if specified
-            if delay_between_emails > 0:
-                import time
-                time.sleep(delay_between_emails)
+            sent_at = timezone.now()
+            for email_data, email_log in zip(chunk, email_logs[i:i + SMTP_MAX_RECIPIENTS_PER_MESSAGE]):
+                error = refused.get(email_data.to_email)
+                if error is None:
+                    email_log.status = 'sent'
+                    email_log.sent_at = sent_at
+                    email_log.attachments = attached_files
+                    with self._count_lock:
+                        self.sent_count += 1
+                else:
+                    _mark_log_failed(email_log, error)
+                    with self._count_lock:
+                        self.failed_count += 1
+                    logger.error(f"Failed to send email to {email_data.to_email}: {error}")
+                results.append(error is None)
+            logger.debug("Email sent to %d of %d grouped recipients", len(chunk) - len(refused), len(chunk))
         
+        EmailLog.objects.bulk_update(
+            email_logs, ['status', 'sent_at', 'error_message', 'attachments', 'email_metadata'],
+            batch_size=EMAIL_LOG_BATCH_SIZE
+        )
         return results
     
+    def send_over_connections(self, tasks: list, send_task, max_workers: int = 1) -> list:
+        """
+        Call send_task(task, connection) for each task and return the results
+        
+        With max_workers above 1, tasks are taken from a shared queue by that
+        many threads, each with its own SMTP connection; results are then in
+        no particular order.
+        """
+        if max_workers <= 1 or len(tasks) <= 1:
+            with self.open_connection() as connection:
+                return [send_task(task, connection) for task in tasks]
+        
+        pending = queue.SimpleQueue()
+        for task in tasks:
+            pending.put(task)
+        
+        def send_from_queue():
+            outcomes = []
+            try:
+                with self.open_connection() as connection:
+                    while True:
+                        try:
+                            task = pending.get_nowait()
+                        except queue.Empty:
+                            return outcomes
+                        outcomes.append(send_task(task, connection))
+            finally:
+                # Each worker thread has its own database connection
+                db_connection.close()
+        
+        max_workers = min(max_workers, len(tasks))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='email_api:send') as executor:
+            workers = [executor.submit(send_from_queue) for _ in range(max_workers)]
+            return [outcome for worker in workers for outcome in worker.result()]
+    
+    def send_bulk_emails(self, emails: List[EmailData], campaign_id: int = None, 
+                        delay_between_emails: float = 0, max_workers: int = None) -> Dict[str, int]:
+        """
+        Send multiple emails over shared SMTP connections with optional delay
+        
+        max_workers defaults to EMAIL_CONFIG['CONNECTION_POOL_SIZE']. Sends are
+        spaced delay_between_emails apart across all workers, so the pool can
+        overlap network I/O without exceeding that rate. Logs are written in
+        bulk per SEND_BATCH_SIZE emails.
+        
+        The failure ratio is checked after every email: once more than
+        BULK_ABORT_FAILURE_RATIO of at least BULK_ABORT_MIN_ATTEMPTS sends have
+        failed, the emails not yet tried are logged as failed and counted as
+        aborted. Failures with a temporary (4xx) SMTP reply are also counted
+        as retryable.
+        """
+        if max_workers is None:
+            max_workers = settings.EMAIL_CONFIG.get('CONNECTION_POOL_SIZE', 1)
+        rate_limiter = TokenBucket(1 / delay_between_emails) if delay_between_emails > 0 else None
+        started = time.monotonic()
+        
+        batches = [emails[i:i + SEND_BATCH_SIZE] for i in range(0, len(emails), SEND_BATCH_SIZE)]
+        
+        # Outcomes of this call so far, shared by the workers
+        attempts = {'sent': 0, 'failed': 0, 'retryable': 0}
+        attempts_lock = threading.Lock()
+        
+        def too_many_failures():
+            tried = attempts['sent'] + attempts['failed']
+            return tried >= BULK_ABORT_MIN_ATTEMPTS and attempts['failed'] > tried * BULK_ABORT_FAILURE_RATIO
+        
+        def record_attempt(email_log):
+            with attempts_lock:
+                if email_log.status == 'sent':
+                    attempts['sent'] += 1
+                else:
+                    attempts['failed'] += 1
+                    attempts['retryable'] += bool(email_log.email_metadata.get('retryable'))
+                return too_many_failures()
+        
+        def send_one_batch(batch, connection):
+            with attempts_lock:
+                abort = too_many_failures()
+            if abort:
+                self._log_unsent(batch, campaign_id, BULK_ABORT_MESSAGE)
+                return []
+            return self.send_batch(batch, campaign_id, connection, rate_limiter, should_stop=record_attempt)
+        
+        self.send_over_connections(batches, send_one_batch, max_workers)
+        sent, failed = attempts['sent'], attempts['failed']
+        aborted = len(emails) - sent - failed
+        if aborted:
+            logger.warning(f"Bulk send aborted after {failed} of {sent + failed} emails failed; "
+                           f"{aborted} emails not sent")
+        logger.info(f"Bulk send: {sent}/{len(emails)} emails sent in {time.monotonic() - started:.1f}s")
+        return {"sent": sent, "failed": failed, "retryable": attempts['retryable'], "aborted": aborted}
+    
     def get_stats(self) -> Dict[str, any]:
         """Get email statistics"""
         total = self.sent_count + self.failed_count
@@ -257,19 +791,10 @@ class EmailSender:
 def get_email_sender(config_name: str = None) -> EmailSender:
     """Factory function to get email sender with specific configuration"""
     if config_name:
-        try:
-            config_obj = EmailConfiguration.objects.get(name=config_name, is_active=True)
-            config = EmailConfig(
-                smtp_server=config_obj.smtp_server,
-                smtp_port=config_obj.smtp_port,
-                username=config_obj.username,
-                password=config_obj.password,
-                use_tls=config_obj.use_tls,
-                use_ssl=config_obj.use_ssl
-            )
+        config = _load_named_config(config_name)
+        if config is not None:
             return EmailSender(config)
-        except EmailConfiguration.DoesNotExist:
-            logger.warning(f"Email configuration '{config_name}' not found, using default")
+        logger.warning(f"Email configuration '{config_name}' not found, using default")
     
     return EmailSender()
 
@@ -288,8 +813,6 @@ def send_single_email(template, recipient_email, recipient_name='', variables=No
         dict with success status and error message if any
     """
     try:
-        from string import Template
-        
         # Prepare variables for template substitution
         if variables is None:
             variables = {}
@@ -312,7 +835,7 @@ def send_single_email(template, recipient_email, recipient_name='', variables=No
         rendered_body = body_template.safe_substitute(**default_vars)
         
         # Get template attachments
-        attachment_ids = [ta.attachment.id for ta in template.attachments.all()]
+        attachment_ids = list(template.attachments.values_list('attachment_id', flat=True))
         
         # Create email data
         email_data = EmailData(
@@ -344,23 +867,39 @@ def send_single_email(template, recipient_email, recipient_name='', variables=No
         }
 
 
-def send_scheduled_campaign_emails(scheduled_campaign):
+def send_scheduled_campaign_emails(scheduled_campaign, due_only=False):
     """
     Send emails for a scheduled campaign
     
     Args:
         scheduled_campaign: ScheduledEmailCampaign object
+        due_only: only send if the campaign's next_send_at has passed
     
     Returns:
         dict with results
     """
+    # Claim the campaign first, so an overlapping cron run or "Send now"
+    # finds it 'sending' and leaves it alone
+    claim = ScheduledEmailCampaign.objects.filter(
+        pk=scheduled_campaign.pk, status__in=SCHEDULED_SENDABLE_STATUSES
+    )
+    if due_only:
+        claim = claim.filter(next_send_at__lte=timezone.now())
+    if not claim.update(status='sending', updated_at=timezone.now()):
+        return {
+            'success': False,
+            'error': 'Campaign is already being sent or is not due',
+            'sent_count': 0,
+            'failed_count': 0
+        }
+    
     try:
-        from string import Template
-        
         template = scheduled_campaign.template
-        recipients = scheduled_campaign.recipients.filter(is_active=True)
+        # Load the recipients once; the list also answers whether there are any
+        recipients = list(scheduled_campaign.recipients.filter(is_active=True))
         
-        if not recipients.exists():
+        if not recipients:
+            _release_scheduled_campaign(scheduled_campaign)
             return {
                 'success': False,
                 'error': 'No active recipients found',
@@ -369,11 +908,8 @@ def send_scheduled_campaign_emails(scheduled_campaign):
             }
         
         sender = get_email_sender()
-        sent_count = 0
-        failed_count = 0
         
         # Create EmailCampaign for logging
-        from .models import EmailCampaign
         email_campaign = EmailCampaign.objects.create(
             name=f"{scheduled_campaign.name} - {timezone.now().strftime('%Y-%m-%d %H:%M')}",
             template=template,
@@ -386,55 +922,74 @@ def send_scheduled_campaign_emails(scheduled_campaign):
         )
         
         # Get template attachments
-        attachment_ids = [ta.attachment.id for ta in template.attachments.all()]
+        attachment_ids = list(template.attachments.values_list('attachment_id', flat=True))
         
-        for recipient in recipients:
-            try:
-                # Prepare variables for template substitution
-                variables = {
-                    'name': recipient.name or recipient.email,
-                    'first_name': recipient.first_name,
-                    'last_name': recipient.last_name,
-                    'email': recipient.email,
-                    'company': recipient.company,
-                }
-                
-                # Add custom data if available
-                if recipient.additional_data:
-                    variables.update(recipient.additional_data)
-                
-                # Render template
-                subject_template = Template(template.subject)
-                body_template = Template(template.body)
-                
-                rendered_subject = subject_template.safe_substitute(**variables)
-                rendered_body = body_template.safe_substitute(**variables)
-                
-                # Create email data
-                email_data = EmailData(
-                    to_email=recipient.email,
-                    to_name=recipient.name,
-                    subject=rendered_subject,
-                    body=rendered_body,
-                    is_html=template.is_html,
-                    attachment_ids=attachment_ids
-                )
-                
-                # Send email
-                success = sender.send_single_email(email_data, email_campaign.id)
-                if success:
-                    sent_count += 1
-                else:
-                    failed_count += 1
+        # Build the templates once and render them for each recipient
+        render_subject = compile_template(template.subject)
+        render_body = compile_template(template.body)
+        
+        # Without placeholders every recipient gets the same email, which can
+        # go to many of them in one SMTP transaction if enabled
+        group_emails = (
+            settings.EMAIL_CONFIG.get('GROUP_IDENTICAL_EMAILS', False)
+            and '$' not in template.subject and '$' not in template.body
+        )
+        
+        def send_to_recipients(batch, connection):
+            emails = []
+            failed = 0
+            for recipient in batch:
+                try:
+                    # Prepare variables for template substitution
+                    variables = {
+                        'name': recipient.name or recipient.email,
+                        'first_name': recipient.first_name,
+                        'last_name': recipient.last_name,
+                        'email': recipient.email,
+                        'company': recipient.company,
+                    }
                     
-            except Exception as e:
-                logger.error(f"Error sending email to {recipient.email}: {e}")
-                failed_count += 1
+                    # Add custom data if available
+                    if recipient.additional_data:
+                        variables.update(recipient.additional_data)
+                    
+                    # Render template
+                    rendered_subject = render_subject(variables)
+                    rendered_body = render_body(variables)
+                    
+                    # Create email data
+                    emails.append(EmailData(
+                        to_email=recipient.email,
+                        to_name=recipient.name,
+                        subject=rendered_subject,
+                        body=rendered_body,
+                        is_html=template.is_html,
+                        attachment_ids=attachment_ids
+                    ))
+                    
+                except Exception as e:
+                    logger.error(f"Error sending email to {recipient.email}: {e}")
+                    failed += 1
+            
+            # Send the batch, logging it with bulk queries
+            send = sender.send_group if group_emails else sender.send_batch
+            return send(emails, email_campaign.id, connection) + [False] * failed
+        
+        batches = [
+            recipients[i:i + SEND_BATCH_SIZE] for i in range(0, len(recipients), SEND_BATCH_SIZE)
+        ]
+        
+        batch_results = sender.send_over_connections(
+            batches, send_to_recipients, settings.EMAIL_CONFIG.get('CONNECTION_POOL_SIZE', 1)
+        )
+        results = [success for outcomes in batch_results for success in outcomes]
+        
+        sent_count = sum(results)
+        failed_count = len(results) - sent_count
         
         # Update campaign status
         email_campaign.status = 'completed'
         email_campaign.completed_at = timezone.now()
-        email_campaign.save()
         
         # Update scheduled campaign statistics
         scheduled_campaign.total_sent += sent_count
@@ -445,7 +1000,8 @@ def send_scheduled_campaign_emails(scheduled_campaign):
         if scheduled_campaign.interval != 'once':
             next_send = calculate_next_send_time(
                 scheduled_campaign.last_sent_at,
-                scheduled_campaign.interval
+                scheduled_campaign.interval,
+                scheduled_campaign.scheduled_datetime
             )
             
             # Check if we should continue (end_datetime check)
@@ -460,17 +1016,29 @@ def send_scheduled_campaign_emails(scheduled_campaign):
             scheduled_campaign.status = 'completed'
             scheduled_campaign.next_send_at = None
         
-        scheduled_campaign.save()
+        # Commit both campaigns' updates together; F() keeps the totals right
+        # if another send overlaps
+        with transaction.atomic():
+            email_campaign.save(update_fields=['status', 'completed_at'])
+            ScheduledEmailCampaign.objects.filter(pk=scheduled_campaign.pk).update(
+                total_sent=F('total_sent') + sent_count,
+                total_failed=F('total_failed') + failed_count,
+                last_sent_at=scheduled_campaign.last_sent_at,
+                next_send_at=scheduled_campaign.next_send_at,
+                status=scheduled_campaign.status,
+                updated_at=timezone.now(),
+            )
         
         return {
             'success': True,
             'sent_count': sent_count,
             'failed_count': failed_count,
-            'total_recipients': recipients.count()
+            'total_recipients': len(recipients)
         }
         
     except Exception as e:
         logger.error(f"Error sending scheduled campaign emails: {e}")
+        _release_scheduled_campaign(scheduled_campaign)
         return {
             'success': False,
             'error': str(e),
@@ -479,163 +1047,203 @@ def send_scheduled_campaign_emails(scheduled_campaign):
         }
 
 
-def calculate_next_send_time(last_sent, interval):
-    """Calculate the next send time based on interval"""
-    from datetime import timedelta
+def _release_scheduled_campaign(scheduled_campaign):
+    """Return a claimed campaign to the status it had before the send"""
+    ScheduledEmailCampaign.objects.filter(pk=scheduled_campaign.pk, status='sending').update(
+        status=scheduled_campaign.status, updated_at=timezone.now()
+    )
+
+
+def pause_stale_scheduled_sends():
+    """Pause scheduled campaigns claimed by a send that never finished"""
+    stale_count = ScheduledEmailCampaign.objects.filter(
+        status='sending', updated_at__lt=timezone.now() - SCHEDULED_CLAIM_TIMEOUT
+    ).update(status='paused', updated_at=timezone.now())
+    if stale_count:
+        logger.warning(f"Paused {stale_count} scheduled campaign(s) whose send was interrupted")
+    return stale_count
+
+
+def calculate_next_send_time(last_sent, interval, start=None):
+    """
+    Calculate the next send time based on interval
+    
+    Monthly sends fall on the day of the month of start (the campaign's first
+    send), clamped to the last day of shorter months: a campaign started on
+    Jan 31 sends on Feb 28 and then Mar 31.
+    """
+    if interval == 'monthly':
+        # Month arithmetic in local time keeps the day and time of day the user chose
+        start = timezone.localtime(start or last_sent)
+        last_sent = timezone.localtime(last_sent)
+        months = max((last_sent.year - start.year) * 12 + last_sent.month - start.month, 0)
+        next_send = start + relativedelta(months=months)
+        while next_send <= last_sent:
+            months += 1
+            next_send = start + relativedelta(months=months)
+        return next_send
     
-    if interval == 'hourly':
-        return last_sent + timedelta(hours=1)
-    elif interval == 'daily':
-        return last_sent + timedelta(days=1)
-    elif interval == 'weekly':
-        return last_sent + timedelta(weeks=1)
-    elif interval == 'monthly':
-        # Approximate monthly as 30 days
-        return last_sent + timedelta(days=30)
-    else:
-        return last_sent
+    delta = _INTERVAL_DELTA.get(interval)
+    return last_sent + delta if delta else last_sent
 
 
-def send_sequential_campaign_email(sequential_campaign_id):
-    """Send the next email in a sequential campaign"""
-    from .models import SequentialEmailCampaign, SequentialEmailRecipient
-    from datetime import timedelta
-    import threading
+def send_sequential_campaign_batch(sequential_campaign_id, batch_size=SEQUENTIAL_SEND_BATCH_SIZE):
+    """
+    Send the emails of a sequential campaign that are due, over one SMTP connection
+    
+    Nothing is scheduled in-process; the send_sequential_emails management
+    command calls this periodically for every sending campaign, so progress
+    survives restarts. Usually one email is due per run; more are sent
+    together when the command has fallen behind the campaign's schedule.
+    
+    Due recipients are claimed by moving them to 'sending' before any email
+    goes out, so overlapping runs never send to the same recipient twice.
+    While a recipient is 'sending', sent_at holds the time it was claimed.
+    
+    Args:
+        sequential_campaign_id: int - SequentialEmailCampaign ID
+        batch_size: int - most emails to send in one call
     
+    Returns:
+        dict with results
+    """
     try:
-        sequential_campaign = SequentialEmailCampaign.objects.get(id=sequential_campaign_id)
+        sequential_campaign = SequentialEmailCampaign.objects.select_related('template').get(
+            id=sequential_campaign_id
+        )
+        _fail_stale_sequential_claims(sequential_campaign)
         
-        # Get the next recipient to send to
-        next_recipient = SequentialEmailRecipient.objects.filter(
+        # Get the next recipients to send to, plus one more so the last send
+        # can be detected without counting the rest
+        upcoming = list(SequentialEmailRecipient.objects.filter(
             campaign=sequential_campaign,
-            status='pending'
-        ).order_by('send_order').first()
+            status__in=SEQUENTIAL_UNSENT_STATUSES
+        ).select_related('recipient').order_by('send_order')[:batch_size + 1])
         
-        if not next_recipient:
+        if not upcoming:
+            if sequential_campaign.sequential_recipients.filter(status='sending').exists():
+                # Another run is still sending the last emails; it completes the campaign
+                return {'success': True, 'message': 'Waiting for emails being sent by another run'}
+            
             # No more recipients, mark campaign as completed
             sequential_campaign.status = 'completed'
-            sequential_campaign.save()
+            sequential_campaign.save(update_fields=['status', 'updated_at'])
             logger.info(f"Sequential campaign {sequential_campaign.name} completed")
             return {'success': True, 'message': 'Campaign completed'}
         
-        # Check if it's time to send
+        # Pick the recipients whose send time has come
         now = timezone.now()
-        expected_send_time = (sequential_campaign.start_datetime + 
-                            timedelta(minutes=next_recipient.send_order * sequential_campaign.interval_minutes))
-        
-        if now < expected_send_time:
-            # Not yet time to send, schedule for later
-            delay_seconds = (expected_send_time - now).total_seconds()
-            if delay_seconds > 0:
-                timer = threading.Timer(delay_seconds, send_sequential_campaign_email, [sequential_campaign_id])
-                timer.start()
-                logger.info(f"Scheduled next email for {expected_send_time}")
-                return {'success': True, 'message': f'Next email scheduled for {expected_send_time}'}
-        
-        # Time to send the email
-        try:
-            # Get the template and recipient
-            template = sequential_campaign.template
-            recipient = next_recipient.recipient
-            
-            # Prepare variables for template rendering
-            variables = {
-                'name': recipient.name,
-                'first_name': recipient.name.split()[0] if recipient.name else '',
-                'last_name': ' '.join(recipient.name.split()[1:]) if len(recipient.name.split()) > 1 else '',
-                'email': recipient.email,
-                'company': '',  # Add company field if available in recipient model
-            }
-            
-            # Render template with placeholders
-            from string import Template
-            
-            subject_template = Template(template.subject)
-            body_template = Template(template.body)
-            
-            rendered_subject = subject_template.safe_substitute(**variables)
-            rendered_body = body_template.safe_substitute(**variables)
-            
-            # Get template attachments
-            attachment_ids = [ta.attachment.id for ta in template.attachments.all()]
-            
-            # Prepare email data
-            email_data = EmailData(
-                to_email=recipient.email,
-                to_name=recipient.name,
-                subject=rendered_subject,
-                body=rendered_body,
-                is_html=template.is_html,
-                attachment_ids=attachment_ids
-            )
-            
-            # Send the email
-            sender = get_email_sender()
-            success = sender.send_single_email(email_data, campaign_id=sequential_campaign.id)
-            
-            if success:
-                # Update recipient status
-                next_recipient.status = 'sent'
-                next_recipient.sent_at = timezone.now()
-                next_recipient.save()
-                
-                # Update campaign progress
-                sequential_campaign.emails_sent += 1
-                
-                # Check if this was the last email
-                remaining_recipients = SequentialEmailRecipient.objects.filter(
-                    campaign=sequential_campaign,
-                    status='pending'
-                ).count()
-                
-                if remaining_recipients == 0:
-                    sequential_campaign.status = 'completed'
-                    logger.info(f"Sequential campaign {sequential_campaign.name} completed")
-                else:
-                    # Schedule next email
-                    next_delay_minutes = sequential_campaign.interval_minutes
-                    timer = threading.Timer(
-                        next_delay_minutes * 60, 
-                        send_sequential_campaign_email, 
-                        [sequential_campaign_id]
-                    )
-                    timer.start()
-                    logger.info(f"Next email scheduled in {next_delay_minutes} minutes")
-                
-                sequential_campaign.save()
-                
-                return {
-                    'success': True,
-                    'recipient': recipient.email,
-                    'send_order': next_recipient.send_order,
-                    'remaining': remaining_recipients
-                }
-            else:
-                # Mark as failed and continue with next
-                next_recipient.status = 'failed'
-                next_recipient.save()
-                
-                # Try to send next email after a short delay
-                timer = threading.Timer(60, send_sequential_campaign_email, [sequential_campaign_id])  # 1 minute delay
-                timer.start()
-                
-                return {
-                    'success': False,
-                    'error': f'Failed to send to {recipient.email}',
-                    'recipient': recipient.email
+        interval = timedelta(minutes=sequential_campaign.interval_minutes)
+        due_recipients = []
+        for seq_recipient in upcoming[:batch_size]:
+            expected_send_time = sequential_campaign.start_datetime + seq_recipient.send_order * interval
+            if now < expected_send_time:
+                break
+            due_recipients.append(seq_recipient)
+        
+        if not due_recipients:
+            # Not yet time to send; a later run of the command picks it up
+            return {'success': True, 'message': f'Next email scheduled for {expected_send_time}'}
+        
+        # Claim each due recipient with a conditional update; a recipient
+        # another run has already claimed matches no row and is left to it
+        due_recipients = [
+            seq_recipient for seq_recipient in due_recipients
+            if SequentialEmailRecipient.objects.filter(
+                pk=seq_recipient.pk, status__in=SEQUENTIAL_UNSENT_STATUSES
+            ).update(status='sending', sent_at=now)
+        ]
+        if not due_recipients:
+            return {'success': True, 'message': 'Due emails are being sent by another run'}
+        
+        template = sequential_campaign.template
+        render_subject = compile_template(template.subject)
+        render_body = compile_template(template.body)
+        attachment_ids = list(template.attachments.values_list('attachment_id', flat=True))
+        
+        emails = []
+        rendered_recipients = []
+        for seq_recipient in due_recipients:
+            recipient = seq_recipient.recipient
+            try:
+                # Prepare variables for template rendering
+                name_parts = recipient.name.split() if recipient.name else []
+                variables = {
+                    'name': recipient.name,
+                    'first_name': name_parts[0] if name_parts else '',
+                    'last_name': ' '.join(name_parts[1:]),
+                    'email': recipient.email,
+                    'company': '',  # Add company field if available in recipient model
                 }
                 
-        except Exception as e:
-            logger.error(f"Error sending sequential email: {e}")
-            # Mark recipient as failed
-            next_recipient.status = 'failed'
-            next_recipient.save()
-            
-            # Try next recipient after delay
-            timer = threading.Timer(60, send_sequential_campaign_email, [sequential_campaign_id])
-            timer.start()
+                emails.append(EmailData(
+                    to_email=recipient.email,
+                    to_name=recipient.name,
+                    subject=render_subject(variables),
+                    body=render_body(variables),
+                    is_html=template.is_html,
+                    attachment_ids=attachment_ids
+                ))
+                rendered_recipients.append(seq_recipient)
+            except Exception as e:
+                logger.error(f"Error sending sequential email to {recipient.email}: {e}")
+                seq_recipient.status = 'failed'
+        
+        # Send the due emails over one connection. Their logs have no
+        # EmailCampaign; a sequential campaign is a different model.
+        if emails:
+            try:
+                sender = get_email_sender()
+                with sender.open_connection() as connection:
+                    results = sender.send_batch(emails, connection=connection)
+            except Exception:
+                # Release the claim so a later run retries these recipients
+                SequentialEmailRecipient.objects.filter(
+                    pk__in=[seq_recipient.pk for seq_recipient in due_recipients], status='sending'
+                ).update(status='scheduled', sent_at=None)
+                raise
             
-            return {'success': False, 'error': str(e)}
+            sent_at = timezone.now()
+            for seq_recipient, success in zip(rendered_recipients, results):
+                if success:
+                    seq_recipient.status = 'sent'
+                    seq_recipient.sent_at = sent_at
+                else:
+                    seq_recipient.status = 'failed'
+        
+        sent_count = sum(seq_recipient.status == 'sent' for seq_recipient in due_recipients)
+        failed_count = len(due_recipients) - sent_count
+        finished = len(upcoming) == len(due_recipients)
+        
+        # Record the outcome; F() keeps the counters right if runs overlap
+        with transaction.atomic():
+            SequentialEmailRecipient.objects.bulk_update(due_recipients, ['status', 'sent_at'])
+            # Never complete while another run still has emails in flight
+            if finished and sequential_campaign.sequential_recipients.filter(status='sending').exists():
+                finished = False
+            campaign_updates = {
+                'emails_sent': F('emails_sent') + sent_count,
+                'emails_failed': F('emails_failed') + failed_count,
+                'updated_at': timezone.now(),
+            }
+            if finished:
+                campaign_updates['status'] = 'completed'
+            SequentialEmailCampaign.objects.filter(pk=sequential_campaign.pk).update(**campaign_updates)
+        
+        if finished:
+            logger.info(f"Sequential campaign {sequential_campaign.name} completed")
+            remaining = 0
+        else:
+            remaining = SequentialEmailRecipient.objects.filter(
+                campaign=sequential_campaign, status__in=SEQUENTIAL_UNSENT_STATUSES
+            ).count()
+        
+        return {
+            'success': sent_count > 0,
+            'sent_count': sent_count,
+            'failed_count': failed_count,
+            'remaining': remaining
+        }
             
     except SequentialEmailCampaign.DoesNotExist:
         logger.error(f"Sequential campaign {sequential_campaign_id} not found")
@@ -645,10 +1253,20 @@ def send_sequential_campaign_email(sequential_campaign_id):
         return {'success': False, 'error': str(e)}
 
 
+def _fail_stale_sequential_claims(sequential_campaign):
+    """Mark recipients claimed by a run that never finished as failed"""
+    stale_count = sequential_campaign.sequential_recipients.filter(
+        status='sending', sent_at__lt=timezone.now() - SEQUENTIAL_CLAIM_TIMEOUT
+    ).update(status='failed', sent_at=None, error_message='Sending was interrupted')
+    if stale_count:
+        SequentialEmailCampaign.objects.filter(pk=sequential_campaign.pk).update(
+            emails_failed=F('emails_failed') + stale_count, updated_at=timezone.now()
+        )
+        logger.warning(f"Sequential campaign {sequential_campaign.name}: {stale_count} interrupted sends marked failed")
+
+
 def start_sequential_campaign(sequential_campaign_id):
     """Start a sequential email campaign"""
-    from .models import SequentialEmailCampaign
-    
     try:
         sequential_campaign = SequentialEmailCampaign.objects.get(id=sequential_campaign_id)
         
@@ -657,20 +1275,10 @@ def start_sequential_campaign(sequential_campaign_id):
         
         # Update campaign status
         sequential_campaign.status = 'sending'
-        sequential_campaign.save()
+        sequential_campaign.save(update_fields=['status', 'updated_at'])
         
-        # Start the sequential sending process
-        now = timezone.now()
-        if sequential_campaign.start_datetime <= now:
-            # Start immediately
-            send_sequential_campaign_email(sequential_campaign_id)
-        else:
-            # Schedule for start time
-            delay_seconds = (sequential_campaign.start_datetime - now).total_seconds()
-            import threading
-            timer = threading.Timer(delay_seconds, send_sequential_campaign_email, [sequential_campaign_id])
-            timer.start()
-            logger.info(f"Sequential campaign scheduled to start at {sequential_campaign.start_datetime}")
+        # The send_sequential_emails command sends each email once it is due
+        logger.info(f"Sequential campaign scheduled to start at {sequential_campaign.start_datetime}")
         
         return {
             'success': True,
@@ -687,14 +1295,12 @@ def start_sequential_campaign(sequential_campaign_id):
 
 def pause_sequential_campaign(sequential_campaign_id):
     """Pause a sequential email campaign"""
-    from .models import SequentialEmailCampaign
-    
     try:
         sequential_campaign = SequentialEmailCampaign.objects.get(id=sequential_campaign_id)
         
         if sequential_campaign.status == 'sending':
             sequential_campaign.status = 'paused'
-            sequential_campaign.save()
+            sequential_campaign.save(update_fields=['status', 'updated_at'])
             return {'success': True, 'message': 'Campaign paused'}
         else:
             return {'success': False, 'error': 'Campaign is not currently sending'}
@@ -708,17 +1314,14 @@ def pause_sequential_campaign(sequential_campaign_id):
 
 def resume_sequential_campaign(sequential_campaign_id):
     """Resume a paused sequential email campaign"""
-    from .models import SequentialEmailCampaign
-    
     try:
         sequential_campaign = SequentialEmailCampaign.objects.get(id=sequential_campaign_id)
         
         if sequential_campaign.status == 'paused':
             sequential_campaign.status = 'sending'
-            sequential_campaign.save()
+            sequential_campaign.save(update_fields=['status', 'updated_at'])
             
-            # Resume sending
-            send_sequential_campaign_email(sequential_campaign_id)
+            # The send_sequential_emails command picks up the next due email
             return {'success': True, 'message': 'Campaign resumed'}
         else:
             return {'success': False, 'error': 'Campaign is not paused'}
@@ -732,13 +1335,11 @@ def resume_sequential_campaign(sequential_campaign_id):
 
 def cancel_sequential_campaign(sequential_campaign_id):
     """Cancel a sequential email campaign"""
-    from .models import SequentialEmailCampaign
-    
     try:
         sequential_campaign = SequentialEmailCampaign.objects.get(id=sequential_campaign_id)
         
         sequential_campaign.status = 'cancelled'
-        sequential_campaign.save()
+        sequential_campaign.save(update_fields=['status', 'updated_at'])
         
         return {'success': True, 'message': 'Campaign cancelled'}
             
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -6,17 +8,31 @@ from .widgets import ChicagoDatePickerInput, ChicagoTimePickerInput
 import pandas as pd
 import os
 
+try:
+    import python_calamine  # noqa: F401
+    # Rust-based reader; faster than openpyxl and also reads .xls files
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None  # pandas default
+
+# Recipient columns needed to render and save recipient choices
+RECIPIENT_CHOICE_FIELDS = ('id', 'email', 'name')
+
+# Selected recipients are emailed in the order the list shows them, not the
+# order they were clicked in
+RECIPIENT_ORDER_HELP_TEXT = "Select one or more recipients. Emails are sent in the order they are listed."
+
 
 class SequentialEmailForm(forms.ModelForm):
     """Form for creating sequential email campaigns"""
     
     selected_recipients = forms.ModelMultipleChoiceField(
-        queryset=Recipient.objects.filter(is_active=True),
+        queryset=Recipient.objects.filter(is_active=True).only(*RECIPIENT_CHOICE_FIELDS),
         widget=forms.SelectMultiple(attrs={
             'class': 'form-control',
             'size': '10'
         }),
-        help_text="Select recipients in the order you want emails to be sent"
+        help_text=RECIPIENT_ORDER_HELP_TEXT
     )
     
     class Meta:
@@ -62,26 +78,26 @@ class SequentialEmailForm(forms.ModelForm):
         if self.user and self.user.is_authenticated:
             # Recipients don't have created_by field, so show all active recipients
             self.fields['selected_recipients'] = forms.ModelMultipleChoiceField(
-                queryset=Recipient.objects.filter(is_active=True),
+                queryset=Recipient.objects.filter(is_active=True).only(*RECIPIENT_CHOICE_FIELDS),
                 widget=forms.SelectMultiple(attrs={
                     'class': 'form-control',
                     'size': '8',
                     'multiple': True
                 }),
                 required=True,
-                help_text="Hold Ctrl (or Cmd on Mac) to select multiple recipients in order"
+                help_text=RECIPIENT_ORDER_HELP_TEXT
             )
         else:
             # For anonymous users or testing, show all recipients
             self.fields['selected_recipients'] = forms.ModelMultipleChoiceField(
-                queryset=Recipient.objects.filter(is_active=True),
+                queryset=Recipient.objects.filter(is_active=True).only(*RECIPIENT_CHOICE_FIELDS),
                 widget=forms.SelectMultiple(attrs={
                     'class': 'form-control',
                     'size': '8',
                     'multiple': True
                 }),
                 required=True,
-                help_text="Hold Ctrl (or Cmd on Mac) to select multiple recipients in order"
+                help_text=RECIPIENT_ORDER_HELP_TEXT
             )
         
         # Set help texts
@@ -109,41 +125,28 @@ class SequentialEmailForm(forms.ModelForm):
         start_time = cleaned_data.get('start_time')
         
         if start_date and start_time:
-            from datetime import datetime, timedelta
-            from django.utils import timezone as django_timezone
-            import pytz
-            
-            # Combine date and time
-            naive_dt = datetime.combine(start_date, start_time)
-            
             # Get user timezone (default to Chicago)
             user_timezone = getattr(self, '_user_timezone', 'America/Chicago')
             
             try:
-                # Convert to user timezone first, then to UTC
-                user_tz = pytz.timezone(user_timezone)
-                local_dt = user_tz.localize(naive_dt)
-                utc_dt = local_dt.astimezone(pytz.UTC)
-                
-                # Make it Django timezone-aware
-                aware_dt = django_timezone.make_aware(utc_dt.replace(tzinfo=None), django_timezone.utc)
-                
-                # Check if it's in the future (with 2 minute buffer)
-                current_time = django_timezone.now()
-                buffer_time = current_time - timedelta(minutes=2)
-                
-                if aware_dt <= buffer_time:
-                    current_local = current_time.astimezone(user_tz)
-                    error_msg = f"Start time must be in the future. Current time in {user_timezone}: {current_local.strftime('%m/%d/%Y %I:%M %p')}"
-                    raise ValidationError(error_msg)
-                    
-                # Store the combined datetime for saving
-                cleaned_data['combined_datetime'] = aware_dt
-                
-            except pytz.exceptions.UnknownTimeZoneError:
+                user_tz = ZoneInfo(user_timezone)
+            except (ZoneInfoNotFoundError, ValueError):
                 raise ValidationError(f"Invalid timezone: {user_timezone}")
-            except Exception as e:
-                raise ValidationError(f"Error processing date/time: {str(e)}")
+            
+            # Combine date and time in the user timezone, then convert to UTC
+            aware_dt = datetime.combine(start_date, start_time, tzinfo=user_tz).astimezone(dt_timezone.utc)
+            
+            # Check if it's in the future (with 2 minute buffer)
+            current_time = timezone.now()
+            buffer_time = current_time - timedelta(minutes=2)
+            
+            if aware_dt <= buffer_time:
+                current_local = current_time.astimezone(user_tz)
+                error_msg = f"Start time must be in the future. Current time in {user_timezone}: {current_local.strftime('%m/%d/%Y %I:%M %p')}"
+                raise ValidationError(error_msg)
+            
+            # Store the combined datetime for saving
+            cleaned_data['combined_datetime'] = aware_dt
         
         return cleaned_data
     
@@ -168,30 +171,7 @@ class SequentialEmailForm(forms.ModelForm):
         campaign = super().save(commit=commit)
         
         if commit:
-            # Clear existing recipients
-            campaign.sequential_recipients.all().delete()
-            
-            # Add selected recipients in order
-            selected_recipients = self.cleaned_data.get('selected_recipients', [])
-            campaign.total_recipients = len(selected_recipients)
-            campaign.save()
-            
-            # Create sequential recipient entries
-            from .models import SequentialEmailRecipient
-            from datetime import timedelta
-            
-            for i, recipient in enumerate(selected_recipients):
-                scheduled_time = campaign.start_datetime + timedelta(
-                    minutes=campaign.interval_minutes * i
-                )
-                
-                SequentialEmailRecipient.objects.create(
-                    campaign=campaign,
-                    recipient=recipient,
-                    send_order=i,
-                    scheduled_time=scheduled_time,
-                    status='scheduled'
-                )
+            campaign.set_recipients(self.cleaned_data.get('selected_recipients', []))
         
         return campaign
 
@@ -237,7 +217,7 @@ class ScheduledEmailForm(forms.ModelForm):
         self.fields['scheduled_datetime'].required = True
         
         # Set help texts
-        self.fields['recipients'].help_text = "Select one or more recipients. Hold Ctrl/Cmd to select multiple."
+        self.fields['recipients'].help_text = "Select one or more recipients."
         self.fields['scheduled_datetime'].help_text = "When to start sending emails"
         self.fields['end_datetime'].help_text = "For recurring emails, when to stop (optional)"
         
@@ -290,7 +270,15 @@ class ScheduledEmailForm(forms.ModelForm):
 class BulkImportRecipientsForm(forms.Form):
     """Form for bulk importing recipients from CSV/Excel files"""
     
-    SUPPORTED_FORMATS = ['.csv', '.xlsx', '.xls']
+    SUPPORTED_FORMATS = frozenset({'.csv', '.xlsx', '.xls'})
+    CSV_CHUNK_SIZE = 1000  # Rows read from a CSV file at a time
+    # File columns and the row data keys they are read into
+    IMPORT_COLUMNS = {
+        'display name': 'name',
+        'first name': 'first_name',
+        'last name': 'last_name',
+        'email': 'email',
+    }
     
     file = forms.FileField(
         label="Import File",
@@ -313,11 +301,11 @@ class BulkImportRecipientsForm(forms.Form):
         if not file:
             return file
         
-        # Check file extension
-        file_ext = os.path.splitext(file.name)[1].lower()
-        if file_ext not in self.SUPPORTED_FORMATS:
+        # Check file extension; kept for reading the file
+        self._file_ext = os.path.splitext(file.name)[1].lower()
+        if self._file_ext not in self.SUPPORTED_FORMATS:
             raise ValidationError(
-                f"Unsupported file format. Please upload a file with one of these extensions: {', '.join(self.SUPPORTED_FORMATS)}"
+                f"Unsupported file format. Please upload a file with one of these extensions: {', '.join(sorted(self.SUPPORTED_FORMATS))}"
             )
         
         # Check file size (limit to 10MB)
@@ -326,82 +314,83 @@ class BulkImportRecipientsForm(forms.Form):
         
         return file
     
+    def _is_import_column(self, column):
+        return str(column).strip().lower() in self.IMPORT_COLUMNS
+    
     def process_file(self):
         """Process the uploaded file and return a list of recipient data"""
+        return list(self.iter_file_rows())
+    
+    def iter_file_rows(self):
+        """
+        Yield recipient data from the uploaded file one row at a time.
+        
+        CSV files are read in chunks of CSV_CHUNK_SIZE rows so large imports
+        are never fully loaded into memory. Row errors are collected and raised
+        as a single ValidationError once the whole file has been read.
+        """
         file = self.cleaned_data.get('file')
         if not file:
-            return []
+            return
         
-        file_ext = os.path.splitext(file.name)[1].lower()
+        file_ext = self._file_ext
         
         try:
             # Read the file based on its extension
+            # Only the import columns are parsed, as text, skipping type inference
+            read_options = {'usecols': self._is_import_column, 'dtype': str}
             if file_ext == '.csv':
-                df = pd.read_csv(file)
-            elif file_ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file)
+                chunks = pd.read_csv(file, chunksize=self.CSV_CHUNK_SIZE, **read_options)
+            elif file_ext in ('.xlsx', '.xls'):
+                chunks = [pd.read_excel(file, engine=EXCEL_ENGINE, **read_options)]
             else:
                 raise ValidationError("Unsupported file format.")
             
-            # Normalize column names (case-insensitive and strip whitespace)
-            df.columns = df.columns.str.strip().str.lower()
-            
-            # Check for required columns
-            required_columns = ['display name', 'first name', 'last name']
-            optional_columns = ['email']  # Email is optional, will be generated if not provided
-            missing_columns = []
-            
-            for col in required_columns:
-                if col not in df.columns:
-                    missing_columns.append(col)
-            
-            if missing_columns:
-                raise ValidationError(
-                    f"Missing required columns: {', '.join(missing_columns)}. "
-                    f"Expected columns: {', '.join(required_columns)}. "
-                    f"Optional columns: {', '.join(optional_columns)}"
-                )
-            
-            # Process the data
-            recipients_data = []
             errors = []
             
-            for index, row in df.iterrows():
-                try:
-                    # Get values and handle NaN
-                    display_name = str(row['display name']).strip() if pd.notna(row['display name']) else ''
-                    first_name = str(row['first name']).strip() if pd.notna(row['first name']) else ''
-                    last_name = str(row['last name']).strip() if pd.notna(row['last name']) else ''
-                    
-                    # Get email if provided
-                    email = ''
-                    if 'email' in df.columns and pd.notna(row['email']):
-                        email = str(row['email']).strip()
-                    
-                    # Skip empty rows
-                    if not any([display_name, first_name, last_name, email]):
-                        continue
-                    
-                    # Validate that we have at least first_name or last_name for email generation
-                    if not email and not first_name and not last_name:
-                        errors.append(f"Row {index + 2}: Either email must be provided or first/last name for email generation")
-                        continue
-                    
-                    recipients_data.append({
-                        'name': display_name,
-                        'first_name': first_name,
-                        'last_name': last_name,
-                        'email': email,  # May be empty, will be generated in admin
-                        'row_number': index + 2  # +2 because of 0-indexing and header row
-                    })
+            for df in chunks:
+                # Normalize column names (case-insensitive and strip whitespace)
+                df.columns = df.columns.str.strip().str.lower()
+                
+                # Check for required columns
+                required_columns = ['display name', 'first name', 'last name']
+                optional_columns = ['email']  # Email is optional, will be generated if not provided
+                missing_columns = []
+                
+                for col in required_columns:
+                    if col not in df.columns:
+                        missing_columns.append(col)
+                
+                if missing_columns:
+                    raise ValidationError(
+                        f"Missing required columns: {', '.join(missing_columns)}. "
+                        f"Expected columns: {', '.join(required_columns)}. "
+                        f"Optional columns: {', '.join(optional_columns)}"
+                    )
                 
-                except Exception as e:
-                    errors.append(f"Row {index + 2}: {str(e)}")
+                # Normalize the values of the whole chunk at once: missing
+                # cells become '' and everything else a stripped string
+                values = pd.DataFrame({
+                    key: df[col].fillna('').astype(str).str.strip() if col in df.columns else ''
+                    for col, key in self.IMPORT_COLUMNS.items()
+                }, index=df.index)
+                
+                # Skip empty rows
+                non_empty = (values != '').any(axis=1)
+                
+                # Validate that we have at least first_name or last_name for email generation
+                no_email_source = (values['email'] == '') & (values['first_name'] == '') & (values['last_name'] == '')
+                for index in values.index[non_empty & no_email_source]:
+                    errors.append(f"Row {index + 2}: Either email must be provided or first/last name for email generation")
+                
+                # Email may be empty; it is generated on import
+                rows = values[non_empty & ~no_email_source]
+                yield from rows.assign(
+                    row_number=rows.index + 2  # +2 because of 0-indexing and header row
+                ).to_dict('records')
             
             if errors:
                 raise ValidationError("Errors found in file:\n" + "\n".join(errors))
-            
-            return recipients_data
         
         except pd.errors.EmptyDataError:
             raise ValidationError("The uploaded file is empty.")
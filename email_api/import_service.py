@@ -0,0 +1,284 @@
+"""
+Recipient import service.
+Creates and updates recipients from uploaded CSV/Excel files, either inline
+or on a background thread with progress kept in the cache.
+"""
+
+import logging
+import os
+import re
+import time
+import uuid
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from .models import Recipient
+from .tasks import run_in_background
+
+
+logger = logging.getLogger(__name__)
+
+# Number of rows written per query when bulk importing recipients
+IMPORT_BATCH_SIZE = 500
+
+# Recipient columns an import reads or writes; others are left unloaded
+IMPORT_RECIPIENT_FIELDS = ('id', 'email', 'name', 'first_name', 'last_name')
+
+# Removes all whitespace from a name in one pass when generating emails
+_strip_ws = re.compile(r'\s+').sub
+
+# Uploaded files are kept here until the background import has read them
+IMPORT_UPLOAD_DIR = 'bulk_imports'
+
+# How long import progress stays available for the status page
+IMPORT_STATUS_TIMEOUT = 60 * 60 * 24
+
+# An unfinished import with no progress for this long is reported as failed;
+# its thread died, e.g. because the process running it restarted
+IMPORT_STALE_AFTER = 60 * 10
+
+
+def import_recipients(rows, update_existing=False, progress=None, on_row=None) -> dict:
+    """
+    Create or update recipients from parsed file rows
+
+    Args:
+        rows: iterable of dicts as yielded by BulkImportRecipientsForm.iter_file_rows()
+        update_existing: bool - update recipients whose email already exists
+        progress: optional callable receiving the running counts after each batch
+        on_row: optional callable receiving the outcome ('created', 'updated',
+            'skipped' or 'error') and the email or error message of each row
+
+    Returns:
+        dict with created/updated/skipped counts and a list of row errors
+    """
+    result = {
+        'created_count': 0,
+        'updated_count': 0,
+        'skipped_count': 0,
+        'errors': [],
+    }
+    to_create = {}  # New recipients keyed by email, inserted in batches
+    to_update = {}  # Changed existing recipients keyed by pk, updated in batches
+    suffix_counters = {}  # Next numeric suffix to try for each base email
+
+    with transaction.atomic():
+        # Load existing emails once instead of querying per row
+        if update_existing:
+            existing_by_email = Recipient.objects.only(*IMPORT_RECIPIENT_FIELDS).in_bulk(field_name='email')
+            existing_emails = set(existing_by_email)
+        else:
+            existing_by_email = {}
+            existing_emails = set(Recipient.objects.values_list('email', flat=True))
+
+        for data in rows:
+            # Validate up front so malformed rows are a cheap branch, not an exception
+            email, error = _row_email(data)
+            if error:
+                error = f"Row {data.get('row_number', 'unknown')}: {error}"
+                result['errors'].append(error)
+                if on_row:
+                    on_row('error', error)
+                continue
+
+            # Ensure email is unique
+            base_email = email
+            if not update_existing and (email in to_create or email in existing_emails):
+                # Generate unique email by adding counter, resuming after
+                # the suffixes already handed out for this base email
+                at_pos = base_email.rindex('@')
+                name_part, domain = base_email[:at_pos], base_email[at_pos + 1:]
+                counter = suffix_counters.get(base_email, 1)
+                while email in to_create or email in existing_emails:
+                    email = f"{name_part}{counter}@{domain}"
+                    counter += 1
+                suffix_counters[base_email] = counter
+
+            # Check if recipient exists (either saved or pending creation)
+            existing_recipient = to_create.get(email) or existing_by_email.get(email)
+
+            if existing_recipient:
+                if update_existing:
+                    # Update existing recipient
+                    existing_recipient.name = data.get('name') or existing_recipient.name
+                    existing_recipient.first_name = data.get('first_name') or existing_recipient.first_name
+                    existing_recipient.last_name = data.get('last_name') or existing_recipient.last_name
+                    if existing_recipient.pk:
+                        to_update[existing_recipient.pk] = existing_recipient
+                    result['updated_count'] += 1
+                    outcome = 'updated'
+                else:
+                    result['skipped_count'] += 1
+                    outcome = 'skipped'
+            else:
+                # Queue new recipient for bulk insertion
+                to_create[email] = Recipient(
+                    email=email,
+                    name=data.get('name', ''),
+                    first_name=data.get('first_name', ''),
+                    last_name=data.get('last_name', ''),
+                )
+                result['created_count'] += 1
+                outcome = 'created'
+
+            if on_row:
+                on_row(outcome, email)
+
+            # Flush in fixed-size batches to keep memory bounded on large files
+            if len(to_create) >= IMPORT_BATCH_SIZE or len(to_update) >= IMPORT_BATCH_SIZE:
+                _flush_new_recipients(to_create, existing_emails, existing_by_email, update_existing)
+                _flush_updated_recipients(to_update)
+                if progress:
+                    progress(result)
+
+        _flush_new_recipients(to_create, existing_emails, existing_by_email, update_existing)
+        _flush_updated_recipients(to_update)
+
+    return result
+
+
+def _row_email(data):
+    """
+    Get the email for an import row, generating it from the names if needed
+
+    Returns:
+        tuple (email, error) - error is None when the row is usable
+    """
+    email = data.get('email', '').strip()
+
+    if not email:
+        # Generate email from names
+        first_name = _strip_ws('', data.get('first_name', '')).lower()
+        last_name = _strip_ws('', data.get('last_name', '')).lower()
+
+        if first_name and last_name:
+            email = f"{first_name}.{last_name}@example.com"
+        elif first_name:
+            email = f"{first_name}@example.com"
+        elif last_name:
+            email = f"{last_name}@example.com"
+        else:
+            return None, "Cannot generate email without first or last name"
+
+    if '@' not in email:
+        return None, f"Invalid email address: {email}"
+
+    return email, None
+
+
+def _flush_new_recipients(to_create, existing_emails, existing_by_email, update_existing):
+    """Insert queued recipients and track them as existing for the rest of the import"""
+    if not to_create:
+        return
+
+    # bulk_create() bypasses Recipient.save(), so fill in display names here
+    for recipient in to_create.values():
+        if not recipient.name:
+            recipient.name = ' '.join(filter(None, [recipient.first_name, recipient.last_name]))
+    # Recipient.email is unique, so rows inserted concurrently by another
+    # import are skipped by the database instead of aborting this one
+    Recipient.objects.bulk_create(
+        to_create.values(), batch_size=IMPORT_BATCH_SIZE, ignore_conflicts=True
+    )
+
+    existing_emails.update(to_create)
+    if update_existing:
+        if any(recipient.pk is None for recipient in to_create.values()):
+            # Primary keys are not returned when conflicts are ignored, so load the saved rows back
+            existing_by_email.update(
+                Recipient.objects.only(*IMPORT_RECIPIENT_FIELDS).in_bulk(list(to_create), field_name='email')
+            )
+        else:
+            existing_by_email.update(to_create)
+    to_create.clear()
+
+
+def _flush_updated_recipients(to_update):
+    """Write queued changes to existing recipients with batched UPDATE queries"""
+    if not to_update:
+        return
+
+    # bulk_update() bypasses Recipient.save(), so apply its defaults here
+    now = timezone.now()
+    for recipient in to_update.values():
+        if not recipient.name:
+            recipient.name = ' '.join(filter(None, [recipient.first_name, recipient.last_name]))
+        recipient.updated_at = now
+    Recipient.objects.bulk_update(
+        to_update.values(), ['name', 'first_name', 'last_name', 'updated_at'],
+        batch_size=IMPORT_BATCH_SIZE
+    )
+    to_update.clear()
+
+
+def _status_cache_key(import_id):
+    return f"email_api:bulk_import:{import_id}"
+
+
+def get_import_status(import_id):
+    """Get the progress/result of a background import, or None if unknown"""
+    status = cache.get(_status_cache_key(import_id))
+    if (status and status['status'] in ('pending', 'processing')
+            and time.time() - status['updated_at'] > IMPORT_STALE_AFTER):
+        status = {**status, 'status': 'failed', 'error': 'Import stopped before finishing; please upload the file again'}
+    return status
+
+
+def _set_import_status(import_id, **status):
+    # Status is kept in the shared cache so any web worker can report it
+    cache.set(_status_cache_key(import_id), {**status, 'updated_at': time.time()}, IMPORT_STATUS_TIMEOUT)
+
+
+def start_recipient_import(uploaded_file, update_existing=False) -> str:
+    """
+    Store an uploaded file and import it on a background thread
+
+    Returns:
+        str - import ID to look up progress with get_import_status()
+    """
+    import_id = uuid.uuid4().hex
+    file_ext = os.path.splitext(uploaded_file.name)[1].lower()
+    file_name = default_storage.save(f"{IMPORT_UPLOAD_DIR}/{import_id}{file_ext}", uploaded_file)
+
+    _set_import_status(import_id, status='pending', file_name=uploaded_file.name)
+    run_in_background(run_recipient_import, import_id, file_name, uploaded_file.name, update_existing)
+    return import_id
+
+
+def run_recipient_import(import_id, file_name, original_name, update_existing=False):
+    """Import a stored upload, recording progress and the final result in the cache"""
+    from .forms import BulkImportRecipientsForm
+
+    def progress(counts):
+        _set_import_status(import_id, status='processing', file_name=original_name, **counts)
+
+    try:
+        progress({'created_count': 0, 'updated_count': 0, 'skipped_count': 0, 'errors': []})
+
+        with default_storage.open(file_name, 'rb') as f:
+            form = BulkImportRecipientsForm(
+                {'update_existing': update_existing}, {'file': File(f, name=original_name)}
+            )
+            if not form.is_valid():
+                raise ValidationError([
+                    error for errors in form.errors.values() for error in errors
+                ])
+
+            result = import_recipients(form.iter_file_rows(), update_existing, progress)
+
+        _set_import_status(import_id, status='completed', file_name=original_name, **result)
+        logger.info(f"Bulk import {import_id} completed: {result['created_count']} created, "
+                    f"{result['updated_count']} updated, {result['skipped_count']} skipped")
+
+    except ValidationError as e:
+        logger.error(f"Bulk import {import_id} failed: {e}")
+        _set_import_status(import_id, status='failed', file_name=original_name, error='\n'.join(e.messages))
+    except Exception as e:
+        logger.error(f"Bulk import {import_id} failed: {e}")
+        _set_import_status(import_id, status='failed', file_name=original_name,
+                           error=f"Error processing file: {str(e)}")
+    finally:
+        default_storage.delete(file_name)
@@ -1,7 +1,8 @@
+from django.core.files import File
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from email_api.models import Recipient
 from email_api.forms import BulkImportRecipientsForm
+from email_api.import_service import import_recipients
 import os
 
 
@@ -34,17 +35,10 @@ class Command(BaseCommand):
         if not os.path.exists(file_path):
             raise CommandError(f'File does not exist: {file_path}')
 
-        # Create a mock file upload object
+        # Wrap the open file for the form; rows are streamed from it, not read up front
+        source = open(file_path, 'rb')
         try:
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            from django.core.files.uploadedfile import SimpleUploadedFile
-            uploaded_file = SimpleUploadedFile(
-                name=os.path.basename(file_path),
-                content=file_content,
-                content_type='application/octet-stream'
-            )
+            uploaded_file = File(source, name=os.path.basename(file_path))
 
             # Create form and validate
             form_data = {'update_existing': update_existing}
@@ -58,81 +52,39 @@ class Command(BaseCommand):
                         )
                 raise CommandError('Form validation failed')
 
-            # Process the file
-            recipients_data = form.process_file()
-            
-            if not recipients_data:
-                self.stdout.write(
-                    self.style.WARNING('No valid recipient data found in file')
-                )
-                return
-
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
-            errors = []
-
-            self.stdout.write(f'Processing {len(recipients_data)} recipients...')
+            self.stdout.write(f'Processing recipients from {uploaded_file.name}...')
             
             if dry_run:
                 self.stdout.write(
                     self.style.WARNING('DRY RUN MODE - No changes will be made')
                 )
 
-            for data in recipients_data:
-                try:
-                    # Handle email generation
-                    email = data.get('email', '').strip()
-                    
-                    if not email:
-                        # Generate email from names
-                        first_name = data.get('first_name', '').lower().replace(' ', '')
-                        last_name = data.get('last_name', '').lower().replace(' ', '')
-                        
-                        if first_name and last_name:
-                            email = f"{first_name}.{last_name}@example.com"
-                        elif first_name:
-                            email = f"{first_name}@example.com"
-                        elif last_name:
-                            email = f"{last_name}@example.com"
-                        else:
-                            errors.append(f"Row {data.get('row_number', 'unknown')}: Cannot generate email without first or last name")
-                            continue
-
-                    # Check for existing recipient
-                    existing_recipient = None
-                    try:
-                        existing_recipient = Recipient.objects.get(email=email)
-                    except Recipient.DoesNotExist:
-                        pass
-
-                    if existing_recipient:
-                        if update_existing:
-                            if not dry_run:
-                                existing_recipient.name = data.get('name') or existing_recipient.name
-                                existing_recipient.first_name = data.get('first_name') or existing_recipient.first_name
-                                existing_recipient.last_name = data.get('last_name') or existing_recipient.last_name
-                                existing_recipient.save()
-                            updated_count += 1
-                            self.stdout.write(f'  Updated: {email}')
-                        else:
-                            skipped_count += 1
-                            self.stdout.write(f'  Skipped: {email} (already exists)')
-                    else:
-                        if not dry_run:
-                            Recipient.objects.create(
-                                email=email,
-                                name=data.get('name', ''),
-                                first_name=data.get('first_name', ''),
-                                last_name=data.get('last_name', ''),
-                            )
-                        created_count += 1
-                        self.stdout.write(f'  Created: {email}')
-
-                except Exception as e:
-                    error_msg = f"Row {data.get('row_number', 'unknown')}: {str(e)}"
-                    errors.append(error_msg)
-                    self.stdout.write(self.style.ERROR(f'  Error: {error_msg}'))
+            def report_row(outcome, detail):
+                if outcome == 'error':
+                    self.stdout.write(self.style.ERROR(f'  Error: {detail}'))
+                elif outcome == 'skipped':
+                    self.stdout.write(f'  Skipped: {detail} (already exists)')
+                else:
+                    self.stdout.write(f'  {outcome.capitalize()}: {detail}')
+
+            # A dry run performs the same import and rolls it back, so the
+            # preview matches what a real import would do
+            with transaction.atomic():
+                result = import_recipients(form.iter_file_rows(), update_existing, on_row=report_row)
+                if dry_run:
+                    transaction.set_rollback(True)
+
+            created_count = result['created_count']
+            updated_count = result['updated_count']
+            skipped_count = result['skipped_count']
+            errors = result['errors']
+            row_count = created_count + updated_count + skipped_count + len(errors)
+
+            if not row_count:
+                self.stdout.write(
+                    self.style.WARNING('No valid recipient data found in file')
+                )
+                return
 
             # Print summary
             self.stdout.write('\n' + '='*50)
@@ -174,3 +126,5 @@ class Command(BaseCommand):
 
         except Exception as e:
             raise CommandError(f'Error processing file: {str(e)}')
+        finally:
+            source.close()
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from email_api.models import ScheduledEmailCampaign
-from email_api.email_service import send_scheduled_campaign_emails
+from email_api.email_service import pause_stale_scheduled_sends, send_scheduled_campaign_emails
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,6 +25,9 @@ class Command(BaseCommand):
                 self.style.WARNING('DRY RUN MODE - No emails will be sent')
             )
         
+        if not dry_run:
+            pause_stale_scheduled_sends()
+        
         # Get campaigns that are due to be sent
         now = timezone.now()
         due_campaigns = ScheduledEmailCampaign.objects.filter(
@@ -57,7 +60,8 @@ class Command(BaseCommand):
         for campaign in due_campaigns:
             try:
                 self.stdout.write(f'Sending campaign: {campaign.name}')
-                result = send_scheduled_campaign_emails(campaign)
+                # Skips the campaign if another run or "Send now" got to it first
+                result = send_scheduled_campaign_emails(campaign, due_only=True)
                 
                 if result.get('success'):
                     sent_count += 1
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from email_api.models import SequentialEmailCampaign
-from email_api.email_service import send_sequential_campaign_email
+from email_api.email_service import send_sequential_campaign_batch
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,10 +47,10 @@ class Command(BaseCommand):
                     # Update campaign status and start time
                     campaign.status = 'sending'
                     campaign.started_at = timezone.now()
-                    campaign.save()
+                    campaign.save(update_fields=['status', 'started_at', 'updated_at'])
                     
                     # Start the sequential sending process
-                    send_sequential_campaign_email(campaign.id)
+                    send_sequential_campaign_batch(campaign.id)
                     
                     self.stdout.write(
                         self.style.SUCCESS(f'Sequential campaign "{campaign.name}" started successfully!')
@@ -80,6 +80,19 @@ class Command(BaseCommand):
             if campaign.start_datetime and campaign.start_datetime <= now:
                 ready_campaigns.append(campaign)
         
+        # Campaigns already sending get their next due email on each run
+        sending_ids = list(
+            SequentialEmailCampaign.objects.filter(status='sending').values_list('id', flat=True)
+        )
+        if sending_ids:
+            self.stdout.write(f'Continuing {len(sending_ids)} sending sequential campaign(s)')
+            if not dry_run:
+                for sending_id in sending_ids:
+                    try:
+                        send_sequential_campaign_batch(sending_id)
+                    except Exception as e:
+                        logger.error(f'Failed to continue sequential campaign {sending_id}: {str(e)}')
+        
         if not ready_campaigns:
             self.stdout.write(
                 self.style.SUCCESS('No sequential campaigns due for sending.')
@@ -99,11 +112,11 @@ class Command(BaseCommand):
                 # Update campaign status
                 campaign.status = 'sending'
                 campaign.started_at = timezone.now()
-                campaign.save()
+                campaign.save(update_fields=['status', 'started_at', 'updated_at'])
                 
                 # Start the sequential sending process
                 try:
-                    send_sequential_campaign_email(campaign.id)
+                    send_sequential_campaign_batch(campaign.id)
                     self.stdout.write(
                         self.style.SUCCESS(f'Started campaign: {campaign.name}')
                     )
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_api', '0009_split_datetime_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['sent_at'], name='email_api_e_sent_at_c35b19_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['status', 'sent_at'], name='email_api_e_status_e057ed_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_api', '0010_emaillog_sent_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipient',
+            index=models.Index(fields=['name', 'email'], name='email_api_r_name_350a34_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipient',
+            index=models.Index(fields=['is_active', 'created_at'], name='email_api_r_is_acti_4cb78b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledemailcampaign',
+            index=models.Index(fields=['status', 'next_send_at'], name='email_api_s_status_615eac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledemailcampaign',
+            index=models.Index(fields=['scheduled_datetime'], name='email_api_s_schedul_6e4c3f_idx'),
+        ),
+    ]
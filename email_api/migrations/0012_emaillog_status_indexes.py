@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_api', '0011_recipient_scheduledemailcampaign_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['status', 'created_at'], name='email_api_e_status_fc80dd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['campaign', 'status'], name='email_api_e_campaig_3c41d7_idx'),
+        ),
+    ]
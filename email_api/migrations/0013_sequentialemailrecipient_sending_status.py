@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_api', '0012_emaillog_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sequentialemailrecipient',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('scheduled', 'Scheduled'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', max_length=20),
+        ),
+    ]
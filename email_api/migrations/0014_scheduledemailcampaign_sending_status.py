@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-15 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('email_api', '0013_sequentialemailrecipient_sending_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scheduledemailcampaign',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('scheduled', 'Scheduled'), ('active', 'Active'), ('sending', 'Sending'), ('paused', 'Paused'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='draft', max_length=20),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.files.storage import default_storage
@@ -6,6 +6,9 @@ from django_ckeditor_5.fields import CKEditor5Field
 import json
 import os
 
+# Number of sequential campaign recipients inserted per query
+SEQUENTIAL_RECIPIENT_BATCH_SIZE = 1000
+
 
 class EmailTemplate(models.Model):
     """Model for storing email templates with rich formatting"""
@@ -63,6 +66,8 @@ class EmailAttachment(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+    
     def save(self, *args, **kwargs):
         if self.file:
             self.file_size = self.file.size
@@ -77,11 +82,9 @@ class EmailAttachment(models.Model):
         if not self.file_size:
             return "Unknown size"
         
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if self.file_size < 1024.0:
-                return f"{self.file_size:.1f} {unit}"
-            self.file_size /= 1024.0
-        return f"{self.file_size:.1f} TB"
+        # Each unit is 2**10 times the previous one, so the bit length picks the unit
+        exponent = min((self.file_size.bit_length() - 1) // 10, len(self.FILE_SIZE_UNITS) - 1)
+        return f"{self.file_size / (1 << (10 * exponent)):.1f} {self.FILE_SIZE_UNITS[exponent]}"
     
     def get_absolute_path(self):
         """Get absolute file path for email attachment"""
@@ -127,6 +130,10 @@ class Recipient(models.Model):
     
     class Meta:
         ordering = ['name', 'email']
+        indexes = [
+            models.Index(fields=['name', 'email']),
+            models.Index(fields=['is_active', 'created_at']),
+        ]
 
 
 class EmailCampaign(models.Model):
@@ -188,6 +195,12 @@ class EmailLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['sent_at']),
+            models.Index(fields=['status', 'sent_at']),
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['campaign', 'status']),
+        ]
 
 
 class SequentialEmailCampaign(models.Model):
@@ -257,21 +270,52 @@ class SequentialEmailCampaign(models.Model):
     
     def get_recipient_schedule(self):
         """Get the complete schedule for all recipients"""
-        recipients = self.sequential_recipients.all().order_by('send_order')
+        recipients = self.sequential_recipients.select_related('recipient').order_by('send_order')
         schedule = []
         
-        for i, seq_recipient in enumerate(recipients):
-            from datetime import timedelta
-            send_time = self.start_datetime + timedelta(minutes=self.interval_minutes * i)
+        from datetime import timedelta
+        send_time = self.start_datetime
+        step = timedelta(minutes=self.interval_minutes)
+        for seq_recipient in recipients:
             schedule.append({
                 'recipient': seq_recipient.recipient,
                 'send_order': seq_recipient.send_order,
                 'scheduled_time': send_time,
                 'status': seq_recipient.status
             })
+            send_time += step
         
         return schedule
     
+    def set_recipients(self, recipients):
+        """
+        Replace the recipient list with recipients, in send order
+        
+        Each send time is the previous one plus the interval. The recipients
+        and total_recipients are replaced together in one transaction.
+        """
+        from datetime import timedelta
+        scheduled_time = self.start_datetime
+        step = timedelta(minutes=self.interval_minutes)
+        seq_recipients = []
+        for i, recipient in enumerate(recipients):
+            seq_recipients.append(SequentialEmailRecipient(
+                campaign=self,
+                recipient=recipient,
+                send_order=i,
+                scheduled_time=scheduled_time,
+                status='scheduled'
+            ))
+            if scheduled_time:
+                scheduled_time += step
+        
+        with transaction.atomic():
+            self.sequential_recipients.all().delete()
+            self.total_recipients = len(seq_recipients)
+            SequentialEmailCampaign.objects.filter(pk=self.pk).update(total_recipients=self.total_recipients)
+            SequentialEmailRecipient.objects.bulk_create(seq_recipients, batch_size=SEQUENTIAL_RECIPIENT_BATCH_SIZE)
+        return seq_recipients
+    
     class Meta:
         ordering = ['-created_at']
 
@@ -290,6 +334,7 @@ class SequentialEmailRecipient(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('scheduled', 'Scheduled'),
+        ('sending', 'Sending'),
         ('sent', 'Sent'),
         ('failed', 'Failed'),
         ('skipped', 'Skipped'),
@@ -337,6 +382,7 @@ class ScheduledEmailCampaign(models.Model):
         ('draft', 'Draft'),
         ('scheduled', 'Scheduled'),
         ('active', 'Active'),
+        ('sending', 'Sending'),
         ('paused', 'Paused'),
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
@@ -368,6 +414,10 @@ class ScheduledEmailCampaign(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_send_at']),
+            models.Index(fields=['scheduled_datetime']),
+        ]
 
 
 class EmailConfiguration(models.Model):
@@ -167,7 +167,10 @@ class BulkEmailSerializer(serializers.Serializer):
         help_text="Set to true for HTML formatted emails with rich text"
     )
     campaign_name = serializers.CharField(max_length=200, required=False, allow_blank=True)
-    delay_between_emails = serializers.FloatField(default=0, min_value=0)
+    delay_between_emails = serializers.FloatField(
+        default=0, min_value=0,
+        help_text="Minimum seconds between sends, across all SMTP connections"
+    )
     template_id = serializers.IntegerField(required=False, allow_null=True)
     attachment_ids = serializers.ListField(
         child=serializers.IntegerField(),
@@ -0,0 +1,32 @@
+// Placeholder insertion buttons for the email template admin form
+function insertPlaceholder(placeholder) {
+    // Try CKEditor 5 first
+    if (window.editor && window.editor.model) {
+        window.editor.model.change(writer => {
+            const insertPosition = window.editor.model.document.selection.getFirstPosition();
+            writer.insertText(placeholder, insertPosition);
+        });
+        return;
+    }
+
+    // Try to find CKEditor instance
+    const ckInstances = window.CKEDITOR?.instances;
+    if (ckInstances) {
+        const editorName = Object.keys(ckInstances)[0];
+        if (editorName && ckInstances[editorName]) {
+            ckInstances[editorName].insertText(placeholder);
+            return;
+        }
+    }
+
+    // Fallback to textarea
+    const bodyField = document.querySelector('#id_body, textarea[name="body"]');
+    if (bodyField) {
+        const cursorPos = bodyField.selectionStart;
+        const textBefore = bodyField.value.substring(0, cursorPos);
+        const textAfter = bodyField.value.substring(cursorPos);
+        bodyField.value = textBefore + placeholder + textAfter;
+        bodyField.focus();
+        bodyField.setSelectionRange(cursorPos + placeholder.length, cursorPos + placeholder.length);
+    }
+}
@@ -0,0 +1,110 @@
+"""
+Background task helpers.
+Runs work outside the request/response cycle on worker threads.
+
+Task status is kept in the shared cache (settings.CACHES), so any web worker
+can report it. The work itself runs in the process that started it and is
+lost if that process restarts.
+"""
+
+import logging
+import threading
+import uuid
+from types import MappingProxyType
+from django.core.cache import cache
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+# How long a task's status stays available for polling
+TASK_STATUS_TIMEOUT = 60 * 60
+
+# Sample recipient data for test emails; the email is filled in per send
+TEST_EMAIL_SAMPLE_DATA = MappingProxyType({
+    'name': 'Test User',
+    'first_name': 'Test',
+    'last_name': 'User',
+    'company': 'Test Company'
+})
+
+
+def run_in_background(func, *args, **kwargs) -> threading.Thread:
+    """Run func(*args, **kwargs) on a new thread and return the started thread"""
+    def target():
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background task {func.__name__} failed: {e}")
+        finally:
+            # Each thread gets its own database connection; release it when done
+            connection.close()
+
+    thread = threading.Thread(target=target, name=f"email_api:{func.__name__}")
+    thread.start()
+    return thread
+
+
+def send_scheduled_campaign_task(campaign_id):
+    """Send a scheduled campaign by ID, for use with run_in_background()"""
+    from .email_service import send_scheduled_campaign_emails
+    from .models import ScheduledEmailCampaign
+    
+    campaign = ScheduledEmailCampaign.objects.select_related('template', 'created_by').get(pk=campaign_id)
+    result = send_scheduled_campaign_emails(campaign)
+    if not result.get('success'):
+        logger.error(f"Failed to send campaign '{campaign.name}': {result.get('error', 'Unknown error')}")
+    return result
+
+
+def _task_status_key(task_id):
+    return f"email_api:task:{task_id}"
+
+
+def get_task_status(task_id):
+    """Get the status dict stored for a background task, or None if unknown"""
+    return cache.get(_task_status_key(task_id))
+
+
+def set_task_status(task_id, **status):
+    cache.set(_task_status_key(task_id), status, TASK_STATUS_TIMEOUT)
+
+
+def start_test_email(template_id, test_email) -> str:
+    """
+    Send a test email on a background thread
+    
+    Returns:
+        str - task ID to poll with get_task_status()
+    """
+    task_id = uuid.uuid4().hex
+    set_task_status(task_id, state='PENDING')
+    run_in_background(send_test_email_task, task_id, template_id, test_email)
+    return task_id
+
+
+def send_test_email_task(task_id, template_id, test_email):
+    """Send a test email with sample data and record the outcome under task_id"""
+    from .email_service import send_single_email
+    from .models import EmailTemplate
+    
+    try:
+        template = EmailTemplate.objects.get(id=template_id)
+        
+        result = send_single_email(
+            template=template,
+            recipient_email=test_email,
+            recipient_name=TEST_EMAIL_SAMPLE_DATA['name'],
+            variables={**TEST_EMAIL_SAMPLE_DATA, 'email': test_email}
+        )
+        
+        if result.get('success'):
+            set_task_status(task_id, state='SUCCESS', message=f'Test email sent successfully to {test_email}')
+        else:
+            set_task_status(task_id, state='FAILURE', error=result.get('error', 'Unknown error'))
+    
+    except EmailTemplate.DoesNotExist:
+        set_task_status(task_id, state='FAILURE', error='Template not found')
+    except Exception as e:
+        logger.error(f"Error sending test email to {test_email}: {e}")
+        set_task_status(task_id, state='FAILURE', error=str(e))
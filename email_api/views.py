@@ -20,7 +20,7 @@ from .serializers import (
     BulkEmailSerializer, EmailStatsSerializer, TemplateVariablesSerializer,
     EmailAttachmentSerializer
 )
-from .email_service import EmailSender, EmailData, get_email_sender
+from .email_service import EmailSender, EmailData, compile_template, get_email_sender
 
 
 class EmailTemplateViewSet(viewsets.ModelViewSet):
@@ -303,6 +303,10 @@ class SendBulkEmailView(APIView):
                 sender = get_email_sender()
                 emails_to_send = []
                 
+                # Build the templates once and render them for each recipient
+                render_subject = compile_template(data['subject_template'])
+                render_body = compile_template(data['body_template'])
+                
                 for recipient in data['recipients']:
                     # Process template variables
                     variables = recipient.get('variables', {})
@@ -314,11 +318,8 @@ class SendBulkEmailView(APIView):
                         'company': recipient.get('company', '')
                     })
                     
-                    subject_template = Template(data['subject_template'])
-                    body_template = Template(data['body_template'])
-                    
-                    rendered_subject = subject_template.safe_substitute(**variables)
-                    rendered_body = body_template.safe_substitute(**variables)
+                    rendered_subject = render_subject(variables)
+                    rendered_body = render_body(variables)
                     
                     email_data = EmailData(
                         to_email=recipient['email'],
@@ -87,6 +87,28 @@ DATABASES = {
 }
 
 
+# Cache
+# Background task and import progress is written by one process and polled by
+# whichever worker serves the next request, so the cache must be shared rather
+# than per-process memory. Set REDIS_URL to use Redis (needs the redis package);
+# otherwise the database is used, with its table created by "migrate".
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'email_api_cache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -178,6 +200,24 @@ CORS_ALLOWED_HEADERS = [
     'x-requested-with',
 ]
 
+# Logging - set EMAIL_API_LOG_LEVEL=DEBUG to see the email_api debug output
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'email_api': {
+            'handlers': ['console'],
+            'level': os.getenv('EMAIL_API_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 # Email Configuration
 EMAIL_CONFIG = {
     'SMTP_SERVER': os.getenv('SMTP_SERVER', 'smtp.gmail.com'),
@@ -185,6 +225,11 @@ EMAIL_CONFIG = {
     'EMAIL_USERNAME': os.getenv('EMAIL_USERNAME', ''),
     'EMAIL_PASSWORD': os.getenv('EMAIL_PASSWORD', ''),
     'USE_TLS': os.getenv('USE_TLS', 'True').lower() == 'true',
+    # SMTP connections used in parallel to send a scheduled campaign
+    'CONNECTION_POOL_SIZE': int(os.getenv('SMTP_CONNECTION_POOL_SIZE', 1)),
+    # Send campaign emails without placeholders as one message to many
+    # recipients; they then see an undisclosed-recipients To: header
+    'GROUP_IDENTICAL_EMAILS': os.getenv('SMTP_GROUP_IDENTICAL_EMAILS', 'False').lower() == 'true',
 }
 
 # CKEditor 5 Configuration (Secure latest version)